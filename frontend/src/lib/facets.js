@@ -0,0 +1,19 @@
+/* Helpers for the dictionary-encoded facet cubes in `stats.facets`.
+   A cube is { dims: [a, b], values: [[...a values], [...b values]],
+   cells: [[i, j, count], ...] }; work is proportional to the number of
+   non-empty cells, never to the number of papers. */
+
+// Totals along `axis` (0 or 1), optionally restricted to one value of the other axis.
+export function sliceCube(cube, axis, fixedValue) {
+  if (!cube) return [];
+  const other = 1 - axis;
+  const fixed = fixedValue === undefined ? -1 : cube.values[other].indexOf(fixedValue);
+  if (fixedValue !== undefined && fixed < 0) return [];
+  const totals = new Array(cube.values[axis].length).fill(0);
+  for (const cell of cube.cells) {
+    if (fixed < 0 || cell[other] === fixed) totals[cell[axis]] += cell[2];
+  }
+  return cube.values[axis]
+    .map((value, i) => ({ value, count: totals[i] }))
+    .filter((d) => d.count);
+}
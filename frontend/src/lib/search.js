@@ -0,0 +1,81 @@
+/* Client for the sharded inverted index written by the builder under
+   `search/`. `index.json` lists the shards (terms grouped by their first
+   `shard_prefix` characters); each shard holds sorted terms and
+   delta-encoded postings of paper ids, i.e. positions in `data.papers`.
+   Shards are fetched on first use and kept in memory. */
+
+const BASE = "search/";
+let manifestPromise = null;
+const shardPromises = new Map();
+
+// Same normalization as paper_dashboard.matching.normalize_title.
+export function searchTokens(text) {
+  return (text || "").toLowerCase().replace(/[^a-z0-9]+/g, " ").trim().split(" ").filter(Boolean);
+}
+
+function loadJson(path) {
+  return fetch(BASE + path).then((resp) => {
+    if (!resp.ok) throw new Error(`${path}: HTTP ${resp.status}`);
+    return resp.json();
+  });
+}
+
+export function loadSearchManifest() {
+  if (!manifestPromise) manifestPromise = loadJson("index.json").catch(() => null);
+  return manifestPromise;
+}
+
+function loadShard(key) {
+  if (!shardPromises.has(key)) shardPromises.set(key, loadJson(`${key}.json`));
+  return shardPromises.get(key);
+}
+
+function lowerBound(terms, prefix) {
+  let lo = 0;
+  let hi = terms.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (terms[mid] < prefix) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+async function prefixIds(manifest, prefix) {
+  const width = manifest.shard_prefix;
+  // A short prefix spans every shard it starts; a longer one names exactly one.
+  const keys = Object.keys(manifest.shards).filter((key) =>
+    prefix.length >= width ? key === prefix.slice(0, width) : key.startsWith(prefix)
+  );
+  const ids = new Set();
+  for (const shard of await Promise.all(keys.map(loadShard))) {
+    for (let i = lowerBound(shard.terms, prefix); i < shard.terms.length && shard.terms[i].startsWith(prefix); i++) {
+      let id = 0;
+      for (const gap of shard.postings[i]) {
+        id += gap;
+        ids.add(id);
+      }
+    }
+  }
+  return ids;
+}
+
+/* Ids of papers matching every query token as a prefix of a title, venue or
+   category term, or null when the caller should scan instead: there is no
+   usable index, or the index found nothing. Terms only match from their
+   start ("graph" misses "subgraph"), so an empty answer is re-checked by the
+   substring scan. `papersHash` is data.json's `papers_hash`; an index built
+   for any other paper list is ignored. */
+export async function searchPapers(query, papersHash) {
+  const tokens = searchTokens(query);
+  if (!tokens.length) return null;
+  const manifest = await loadSearchManifest();
+  if (!manifest || !papersHash || manifest.papers_hash !== papersHash) return null;
+  let hits = null;
+  for (const token of tokens) {
+    const ids = await prefixIds(manifest, token);
+    hits = hits ? new Set([...hits].filter((id) => ids.has(id))) : ids;
+    if (!hits.size) return null;
+  }
+  return hits;
+}
@@ -0,0 +1,439 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from . import analysis, topics
+from .parser import PaperEntry
+from .table import PaperTable
+
+
+class TitleFeatures:
+    """A title lower-cased once, with its words, topic tokens and keyword
+    labels computed on demand."""
+
+    __slots__ = ("lower", "_words", "_tokens", "_labels")
+
+    def __init__(self, title: str) -> None:
+        self.lower = title.lower()
+        self._words: Optional[List[str]] = None
+        self._tokens: Optional[List[str]] = None
+        self._labels: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def words(self) -> List[str]:
+        """All title words, stopwords included, as bigrams need them."""
+        if self._words is None:
+            self._words = analysis.title_words(self.lower)
+        return self._words
+
+    @property
+    def tokens(self) -> List[str]:
+        if self._tokens is None:
+            stopwords = analysis.STOPWORDS
+            self._tokens = [word for word in self.words if word not in stopwords]
+        return self._tokens
+
+    @property
+    def labels(self) -> Dict[str, List[str]]:
+        """Method, domain and dataset hits from one classifier call."""
+        if self._labels is None:
+            self._labels = analysis.keyword_classifier.classify(self.lower)
+        return self._labels
+
+
+class Accumulator(ABC):
+    """One statistic: folded over papers by ``update``, emitted by ``finalize``.
+
+    ``key`` names the stats entry. Accumulators that read nothing but the
+    title set ``title_only`` and may be passed ``None`` for the paper.
+    """
+
+    key = ""
+    title_only = False
+
+    @abstractmethod
+    def update(self, paper: Optional[PaperEntry], title: TitleFeatures) -> None:
+        ...
+
+    @abstractmethod
+    def finalize(self) -> Any:
+        ...
+
+
+class ColumnarAccumulator(ABC):
+    """Mixin for accumulators that can be answered from ``PaperTable`` columns.
+
+    Given a table, the engine calls ``from_table`` instead of ``finalize``
+    and leaves the accumulator out of the row pass, unless it sets
+    ``needs_titles``: then it still sees every title first, to combine the
+    shared ``TitleFeatures`` with the columns. ``supports`` lets an
+    accumulator use the columns only for some tables, e.g. ones carrying
+    enriched features.
+    """
+
+    needs_titles = False
+
+    @abstractmethod
+    def from_table(self, table: PaperTable) -> Any:
+        ...
+
+    def supports(self, table: PaperTable) -> bool:
+        return True
+
+
+class _CounterAccumulator(Accumulator):
+    def __init__(self) -> None:
+        self.counter: Counter = Counter()
+
+
+class YearCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "year_counts"
+
+    def update(self, paper, title):
+        if paper.year:
+            self.counter[paper.year] += 1
+
+    def finalize(self):
+        return [{"year": year, "count": self.counter[year]} for year in sorted(self.counter)]
+
+    def from_table(self, table):
+        return analysis.counts_by_year(table)
+
+
+class VenueCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "venue_counts"
+
+    def __init__(self, top_k: int = 15) -> None:
+        super().__init__()
+        self.top_k = top_k
+
+    def update(self, paper, title):
+        venue = paper.venue.strip()
+        if venue:
+            self.counter[venue] += 1
+
+    def finalize(self):
+        return [
+            {"venue": venue, "count": count} for venue, count in self.counter.most_common(self.top_k)
+        ]
+
+    def from_table(self, table):
+        return analysis.counts_by_venue(table, self.top_k)
+
+
+class Topics(_CounterAccumulator):
+    key = "topics"
+    title_only = True
+
+    def __init__(self, top_k: int = 20) -> None:
+        super().__init__()
+        self.top_k = top_k
+
+    def update(self, paper, title):
+        self.counter.update(title.tokens)
+
+    def finalize(self):
+        return [
+            {"topic": word, "count": count} for word, count in self.counter.most_common(self.top_k)
+        ]
+
+
+class TopicTerms(Accumulator, ColumnarAccumulator):
+    """TF-IDF unigram and bigram topics overall, per category and per year.
+
+    Title words are only collected here, tokenized once in the shared row
+    pass; the scoring runs vectorized over all of them at once in
+    ``topics.topic_terms``. On a table the words still come from the row
+    pass and the groups from the columns.
+    """
+
+    key = "topic_terms"
+    title_only = True
+    needs_titles = True
+
+    def __init__(self, top_k: int = 20, group_top_k: int = 10) -> None:
+        self.top_k = top_k
+        self.group_top_k = group_top_k
+        self.words: List[List[str]] = []
+        self.years: List[int] = []
+        self.category_codes: List[int] = []
+        self.categories: Dict[str, int] = {}
+
+    def update(self, paper, title):
+        self.words.append(title.words)
+        if paper is not None:
+            self.years.append(paper.year or 0)
+            self.category_codes.append(
+                self.categories.setdefault(paper.category, len(self.categories))
+            )
+
+    def finalize(self):
+        return topics.topic_terms(
+            self.words,
+            self.category_codes,
+            list(self.categories),
+            self.years,
+            self.top_k,
+            self.group_top_k,
+        )
+
+    def from_table(self, table):
+        return topics.topic_terms(
+            self.words,
+            table.category_codes,
+            table.categories.values,
+            table.years,
+            self.top_k,
+            self.group_top_k,
+        )
+
+
+class CodeAvailability(Accumulator, ColumnarAccumulator):
+    key = "code_availability"
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.with_code = 0
+
+    def update(self, paper, title):
+        self.total += 1
+        if paper.has_code:
+            self.with_code += 1
+
+    def finalize(self):
+        percentage = (self.with_code / self.total * 100) if self.total else 0
+        return {
+            "with_code": self.with_code,
+            "without_code": self.total - self.with_code,
+            "total": self.total,
+            "percentage": round(percentage, 2),
+        }
+
+    def from_table(self, table):
+        return analysis.code_availability(table)
+
+
+class CategoryCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "category_counts"
+
+    def update(self, paper, title):
+        self.counter[paper.category] += 1
+
+    def finalize(self):
+        return [{"category": c, "count": self.counter[c]} for c in sorted(self.counter)]
+
+    def from_table(self, table):
+        return analysis.counts_by_category(table)
+
+
+def _ranked(counter: Counter, label: str) -> List[Dict[str, int]]:
+    return [
+        {label: k, "count": counter[k]}
+        for k in sorted(counter, key=lambda x: (-counter[x], x))
+    ]
+
+
+class MethodCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "method_counts"
+    title_only = True
+
+    def update(self, paper, title):
+        self.counter.update(title.labels["methods"] or ["Other"])
+
+    def finalize(self):
+        return _ranked(self.counter, "method")
+
+    def supports(self, table):
+        return table.enriched
+
+    def from_table(self, table):
+        for methods in table.methods:
+            self.counter.update(methods)
+        return self.finalize()
+
+
+class DomainCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "domain_counts"
+    title_only = True
+
+    def update(self, paper, title):
+        domains = title.labels["domains"]
+        self.counter[domains[0] if domains else "General"] += 1
+
+    def finalize(self):
+        return _ranked(self.counter, "domain")
+
+    def supports(self, table):
+        return table.enriched
+
+    def from_table(self, table):
+        domains = table.domains.values
+        for code, count in Counter(table.domain_codes).items():
+            self.counter[domains[code]] += count
+        return self.finalize()
+
+
+class VenueStrata(_CounterAccumulator, ColumnarAccumulator):
+    key = "venue_strata"
+
+    def update(self, paper, title):
+        self.counter[analysis.venue_stratum(paper.venue)] += 1
+
+    def finalize(self):
+        return _ranked(self.counter, "stratum")
+
+    def from_table(self, table):
+        return analysis.venue_strata(table)
+
+
+class DatasetCounts(_CounterAccumulator, ColumnarAccumulator):
+    key = "dataset_counts"
+    title_only = True
+
+    def __init__(self, top_k: int = 12) -> None:
+        super().__init__()
+        self.top_k = top_k
+
+    def update(self, paper, title):
+        self.counter.update(title.labels["datasets"])
+
+    def supports(self, table):
+        return table.enriched
+
+    def from_table(self, table):
+        # Row order, so ``most_common`` breaks ties as the row pass does.
+        for datasets in table.datasets:
+            self.counter.update(datasets)
+        return self.finalize()
+
+    def finalize(self):
+        return [
+            {"dataset": name, "count": count}
+            for name, count in self.counter.most_common(self.top_k)
+        ]
+
+
+class FacetCubes(Accumulator, ColumnarAccumulator):
+    """Two-dimensional sparse counts for cross-filtering, see ``analysis.FACET_CUBES``."""
+
+    key = "facets"
+
+    def __init__(self) -> None:
+        self.counts: Dict[str, Counter] = {name: Counter() for name in analysis.FACET_CUBES}
+
+    def update(self, paper, title):
+        values = analysis.facet_values(paper)
+        for name, (first, second) in analysis.FACET_CUBES.items():
+            counter = self.counts[name]
+            for a in values[first]:
+                for b in values[second]:
+                    counter[(a, b)] += 1
+
+    def finalize(self):
+        return {
+            name: analysis.encode_facet_cube(dims, self.counts[name])
+            for name, dims in analysis.FACET_CUBES.items()
+        }
+
+    def supports(self, table):
+        return table.enriched
+
+    def from_table(self, table):
+        # Per dimension: one hashable key per row and how a key decodes into
+        # dimension values. Code pairs are counted first, so each distinct
+        # pair is decoded once however many rows share it.
+        bitmap = table.has_code
+        strata = [(stratum,) for stratum in table.strata.values]
+        columns = {
+            "year": (table.years, lambda year: (year,) if year else ()),
+            "category": (table.category_codes, lambda code: (table.categories.values[code],)),
+            "domain": (table.domain_codes, lambda code: (table.domains.values[code],)),
+            "method": (table.methods, lambda methods: methods),
+            "venue_stratum": (table.stratum_codes, strata.__getitem__),
+            "code": (
+                [(bitmap[row >> 3] >> (row & 7)) & 1 for row in range(len(table))],
+                lambda bit: ("with_code" if bit else "without_code",),
+            ),
+        }
+        for name, (first, second) in analysis.FACET_CUBES.items():
+            first_keys, first_decode = columns[first]
+            second_keys, second_decode = columns[second]
+            counter = self.counts[name]
+            for (x, y), count in Counter(zip(first_keys, second_keys)).items():
+                for a in first_decode(x):
+                    for b in second_decode(y):
+                        counter[(a, b)] += count
+        return self.finalize()
+
+
+class PaperCount(Accumulator, ColumnarAccumulator):
+    key = "paper_count"
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def update(self, paper, title):
+        self.count += 1
+
+    def finalize(self):
+        return self.count
+
+    def from_table(self, table):
+        return len(table)
+
+
+def default_accumulators() -> List[Accumulator]:
+    """The per-paper statistics in ``build_stats``, in their output order."""
+    return [
+        YearCounts(),
+        VenueCounts(),
+        Topics(),
+        TopicTerms(),
+        CodeAvailability(),
+        CategoryCounts(),
+        MethodCounts(),
+        DomainCounts(),
+        VenueStrata(),
+        DatasetCounts(),
+        FacetCubes(),
+        PaperCount(),
+    ]
+
+
+def run_accumulators(
+    papers: Iterable[PaperEntry], accumulators: Optional[Sequence[Accumulator]] = None
+) -> Dict[str, Any]:
+    """Fold every accumulator over ``papers`` in a single pass.
+
+    Each title is lower-cased and tokenized once and shared by all
+    accumulators, and ``papers`` may be a one-shot stream. Given a
+    ``PaperTable``, columnar statistics are read off its columns and only the
+    title-based ones walk the rows; on a table built from enriched papers
+    the keyword statistics come from the stored features and no title is
+    classified at all. ``topic_terms`` scores the words of the same pass. Results are keyed by ``Accumulator.key``
+    in accumulator order and match the standalone ``analysis`` functions.
+    """
+    if accumulators is None:
+        accumulators = default_accumulators()
+    table = papers if isinstance(papers, PaperTable) else None
+    from_table = {
+        id(acc)
+        for acc in accumulators
+        if table is not None and isinstance(acc, ColumnarAccumulator) and acc.supports(table)
+    }
+    row_accumulators = [
+        acc for acc in accumulators if id(acc) not in from_table or acc.needs_titles
+    ]
+    if row_accumulators:
+        if table is not None and all(acc.title_only for acc in row_accumulators):
+            rows: Iterable = ((None, title) for title in table.titles)
+        else:
+            rows = ((paper, paper.title) for paper in papers)
+        for paper, raw_title in rows:
+            title = TitleFeatures(raw_title)
+            for acc in row_accumulators:
+                acc.update(paper, title)
+    return {
+        acc.key: acc.from_table(table) if id(acc) in from_table else acc.finalize()
+        for acc in accumulators
+    }
@@ -1,9 +1,10 @@
 import logging
 import re
 from collections import Counter
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .parser import PaperEntry
+from .table import PaperTable
 
 
 logger = logging.getLogger(__name__)
@@ -46,23 +47,35 @@ STOPWORDS = {
 }
 
 
+_TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z\-]{2,}")
+
+
+def title_words(lower: str) -> List[str]:
+    """Every word of a lower-cased title, stopwords included."""
+    return _TOKEN_RE.findall(lower)
+
+
+def topic_tokens(lower: str) -> List[str]:
+    """Topic words of a lower-cased title, stopwords removed."""
+    return [token for token in title_words(lower) if token not in STOPWORDS]
+
+
 def word_frequencies(titles: Iterable[str], top_k: int = 20) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
     for title in titles:
-        tokens = re.findall(r"[A-Za-z][A-Za-z\-]{2,}", title.lower())
-        for token in tokens:
-            if token in STOPWORDS:
-                continue
-            counter[token] += 1
+        counter.update(topic_tokens(title.lower()))
     most_common = counter.most_common(top_k)
     return [{"topic": word, "count": count} for word, count in most_common]
 
 
 def counts_by_year(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
-    counter: Counter[int] = Counter()
-    for paper in papers:
-        if paper.year:
-            counter[paper.year] += 1
+    if isinstance(papers, PaperTable):
+        counter = papers.year_histogram()
+    else:
+        counter = Counter()
+        for paper in papers:
+            if paper.year:
+                counter[paper.year] += 1
     return [
         {"year": year, "count": counter[year]}
         for year in sorted(counter.keys())
@@ -71,17 +84,29 @@ def counts_by_year(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
 
 def counts_by_category(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
-    for paper in papers:
-        counter[paper.category] += 1
+    if isinstance(papers, PaperTable):
+        for code, count in papers.category_histogram().items():
+            counter[papers.categories.values[code]] += count
+    else:
+        for paper in papers:
+            counter[paper.category] += 1
     return [{"category": c, "count": counter[c]} for c in sorted(counter.keys())]
 
 
 def counts_by_venue(papers: Iterable[PaperEntry], top_k: int = 15) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
-    for paper in papers:
-        venue = paper.venue.strip()
-        if venue:
-            counter[venue] += 1
+    if isinstance(papers, PaperTable):
+        # Codes are numbered in first-seen order, so ties rank as they would row by row.
+        histogram = papers.venue_histogram()
+        for code in sorted(histogram):
+            venue = papers.venues.values[code].strip()
+            if venue:
+                counter[venue] += histogram[code]
+    else:
+        for paper in papers:
+            venue = paper.venue.strip()
+            if venue:
+                counter[venue] += 1
     most_common = counter.most_common(top_k)
     return [{"venue": venue, "count": count} for venue, count in most_common]
 
@@ -89,10 +114,14 @@ def counts_by_venue(papers: Iterable[PaperEntry], top_k: int = 15) -> List[Dict[
 def code_availability(papers: Iterable[PaperEntry]) -> Dict[str, float]:
     total = 0
     with_code = 0
-    for paper in papers:
-        total += 1
-        if paper.has_code:
-            with_code += 1
+    if isinstance(papers, PaperTable):
+        total = len(papers)
+        with_code = papers.code_count()
+    else:
+        for paper in papers:
+            total += 1
+            if paper.has_code:
+                with_code += 1
     percentage = (with_code / total * 100) if total else 0
     return {
         "with_code": with_code,
@@ -115,17 +144,15 @@ METHOD_KEYWORDS = {
 }
 
 
+def title_methods(lower: str) -> List[str]:
+    """Method families named in a lower-cased title, or ``["Other"]``."""
+    return keyword_classifier.classify(lower, ("methods",))["methods"] or ["Other"]
+
+
 def method_families(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
     for paper in papers:
-        lower = paper.title.lower()
-        matched = False
-        for family, patterns in METHOD_KEYWORDS.items():
-            if any(re.search(pat, lower) for pat in patterns):
-                counter[family] += 1
-                matched = True
-        if not matched:
-            counter["Other"] += 1
+        counter.update(paper_features(paper)["methods"])
     return [{"method": k, "count": counter[k]} for k in sorted(counter.keys(), key=lambda x: (-counter[x], x))]
 
 
@@ -140,17 +167,19 @@ DOMAIN_KEYWORDS = {
 
 
 def infer_domain(title: str) -> str:
-    lower = title.lower()
-    for domain, patterns in DOMAIN_KEYWORDS.items():
-        if any(re.search(pat, lower) for pat in patterns):
-            return domain
-    return "General"
+    return title_domain(title.lower())
+
+
+def title_domain(lower: str) -> str:
+    """First domain whose keywords appear in a lower-cased title."""
+    domains = keyword_classifier.classify(lower, ("domains",))["domains"]
+    return domains[0] if domains else "General"
 
 
 def domain_focus(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
     for paper in papers:
-        counter[infer_domain(paper.title)] += 1
+        counter[paper_features(paper)["domain"]] += 1
     return [{"domain": k, "count": counter[k]} for k in sorted(counter.keys(), key=lambda x: (-counter[x], x))]
 
 
@@ -181,20 +210,28 @@ TOP_VENUES = {
 }
 
 
+def venue_stratum(venue: str) -> str:
+    venue = venue.lower()
+    if "arxiv" in venue:
+        return "arXiv"
+    if "workshop" in venue:
+        return "Workshop"
+    if any(v.lower() in venue for v in TOP_VENUES):
+        return "Top conf/journal"
+    if "journal" in venue or "transactions" in venue:
+        return "Journal"
+    return "Other"
+
+
 def venue_strata(papers: Iterable[PaperEntry]) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
-    for paper in papers:
-        venue = paper.venue.lower()
-        if "arxiv" in venue:
-            counter["arXiv"] += 1
-        elif "workshop" in venue:
-            counter["Workshop"] += 1
-        elif any(v.lower() in venue for v in TOP_VENUES):
-            counter["Top conf/journal"] += 1
-        elif "journal" in venue or "transactions" in venue:
-            counter["Journal"] += 1
-        else:
-            counter["Other"] += 1
+    if isinstance(papers, PaperTable):
+        # Classify each distinct venue once rather than once per paper.
+        for code, count in papers.venue_histogram().items():
+            counter[venue_stratum(papers.venues.values[code])] += count
+    else:
+        for paper in papers:
+            counter[paper.venue_stratum or venue_stratum(paper.venue)] += 1
     return [{"stratum": k, "count": counter[k]} for k in sorted(counter.keys(), key=lambda x: (-counter[x], x))]
 
 
@@ -216,17 +253,184 @@ DATASET_KEYWORDS = {
 }
 
 
+def _first_char(pattern: str) -> Optional[str]:
+    """The literal character every match of ``pattern`` starts with, if any."""
+    if pattern[:1].isalnum() and pattern[1:2] not in ("?", "*", "{"):
+        return pattern[0]
+    return None
+
+
+class KeywordClassifier:
+    """Keyword tables compiled into one regex and applied in one scan per title.
+
+    All distinct patterns form a single alternation inside a lookahead,
+    factored by first character, so ``finditer`` visits each position where
+    any keyword starts, overlapping ones included. An alternation reports
+    only its first matching branch, so at those positions the patterns that
+    can start with that character are matched individually. Labels come back
+    in table order, which keeps first-match-wins rules such as
+    ``title_domain`` exactly as they were.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]) -> None:
+        self.kinds = tuple(tables)
+        patterns: List[str] = []
+        # Pattern index -> (kind, position of its label in the table).
+        self._owners: List[List[Tuple[str, int]]] = []
+        self._labels: Dict[str, List[str]] = {}
+        for kind, table in tables.items():
+            self._labels[kind] = list(table)
+            for position, keywords in enumerate(table.values()):
+                for pattern in keywords:
+                    if pattern not in patterns:
+                        patterns.append(pattern)
+                        self._owners.append([])
+                    self._owners[patterns.index(pattern)].append((kind, position))
+        # First character -> (pattern index, anchored match); None holds patterns
+        # whose first character is not fixed and is tried everywhere.
+        self._candidates: Dict[Optional[str], List[Tuple[int, Callable]]] = {}
+        by_first: Dict[Optional[str], List[str]] = {}
+        for index, pattern in enumerate(patterns):
+            first = _first_char(pattern)
+            self._candidates.setdefault(first, []).append((index, re.compile(pattern).match))
+            by_first.setdefault(first, []).append(pattern)
+        branches = [f"(?:{p})" for p in by_first.pop(None, [])]
+        branches += [
+            first + "(?:" + "|".join(p[1:] for p in rest) + ")" for first, rest in by_first.items()
+        ]
+        self._scan = re.compile("(?=" + "|".join(branches) + ")")
+
+    def classify(
+        self, lower: str, kinds: Optional[Sequence[str]] = None
+    ) -> Dict[str, List[str]]:
+        """Every label of each kind whose keywords occur in ``lower``."""
+        found: Dict[str, set] = {kind: set() for kind in self.kinds}
+        anywhere = self._candidates.get(None, [])
+        for hit in self._scan.finditer(lower):
+            start = hit.start()
+            for index, match in self._candidates.get(lower[start], []) + anywhere:
+                if match(lower, start):
+                    for kind, position in self._owners[index]:
+                        found[kind].add(position)
+        return {
+            kind: [self._labels[kind][position] for position in sorted(found[kind])]
+            for kind in kinds or self.kinds
+        }
+
+
+def title_datasets(lower: str) -> List[str]:
+    """Datasets mentioned in a lower-cased title."""
+    return keyword_classifier.classify(lower, ("datasets",))["datasets"]
+
+
+keyword_classifier = KeywordClassifier(
+    {"methods": METHOD_KEYWORDS, "domains": DOMAIN_KEYWORDS, "datasets": DATASET_KEYWORDS}
+)
+
+
 def dataset_mentions(papers: Iterable[PaperEntry], top_k: int = 12) -> List[Dict[str, int]]:
     counter: Counter[str] = Counter()
     for paper in papers:
-        lower = paper.title.lower()
-        for dataset, patterns in DATASET_KEYWORDS.items():
-            if any(re.search(pat, lower) for pat in patterns):
-                counter[dataset] += 1
+        counter.update(paper_features(paper)["datasets"])
     most_common = counter.most_common(top_k)
     return [{"dataset": name, "count": count} for name, count in most_common]
 
 
+def title_features(lower: str) -> Dict:
+    """Domain, method families and datasets of a lower-cased title, from one
+    classifier call."""
+    labels = keyword_classifier.classify(lower)
+    return {
+        "domain": labels["domains"][0] if labels["domains"] else "General",
+        "methods": labels["methods"] or ["Other"],
+        "datasets": labels["datasets"],
+    }
+
+
+def paper_features(paper: PaperEntry) -> Dict:
+    """A paper's title features, reusing them if ``enrich_papers`` ran."""
+    if paper.domain is not None:
+        return {"domain": paper.domain, "methods": paper.methods, "datasets": paper.datasets}
+    return title_features(paper.title.lower())
+
+
+def enrich_papers(papers: Iterable[PaperEntry]) -> None:
+    """Store derived features on every paper so they are computed only once.
+
+    Sets ``domain``, ``methods``, ``datasets`` and ``venue_stratum``; the
+    aggregations and ``to_serializable`` then read them instead of
+    re-classifying titles, and the frontend receives them with each paper.
+    Venues are classified once per distinct venue.
+    """
+    strata: Dict[str, str] = {}
+    for paper in papers:
+        if paper.domain is None:
+            features = title_features(paper.title.lower())
+            paper.domain = features["domain"]
+            paper.methods = features["methods"]
+            paper.datasets = features["datasets"]
+        if paper.venue_stratum is None:
+            stratum = strata.get(paper.venue)
+            if stratum is None:
+                stratum = strata[paper.venue] = venue_stratum(paper.venue)
+            paper.venue_stratum = stratum
+
+
+# Cube name -> its two dimensions, as shipped under ``stats["facets"]``.
+FACET_CUBES = {
+    "year_category": ("year", "category"),
+    "year_domain": ("year", "domain"),
+    "year_method": ("year", "method"),
+    "stratum_year": ("venue_stratum", "year"),
+    "code_year": ("code", "year"),
+}
+
+
+def facet_values(paper: PaperEntry) -> Dict[str, Tuple]:
+    """The values a paper contributes along each facet dimension.
+
+    A paper without a year adds nothing on the year axis, and one with
+    several method families is counted once under each.
+    """
+    features = paper_features(paper)
+    return {
+        "year": (paper.year,) if paper.year else (),
+        "category": (paper.category,),
+        "domain": (features["domain"],),
+        "method": tuple(features["methods"]),
+        "venue_stratum": (paper.venue_stratum or venue_stratum(paper.venue),),
+        "code": ("with_code" if paper.has_code else "without_code",),
+    }
+
+
+def encode_facet_cube(dims: Sequence[str], counts: Counter) -> Dict:
+    """Dictionary-encode a sparse cube of ``(value, value) -> count``.
+
+    ``values`` holds the distinct values of each dimension (years ascending,
+    code as with/without, everything else by descending total then name)
+    and ``cells`` the non-empty ``[i, j, count]`` triples indexing into
+    them, so a client slices or totals any axis by walking the cells
+    without touching paper rows.
+    """
+    values = []
+    for axis, dim in enumerate(dims):
+        totals: Counter = Counter()
+        for key, count in counts.items():
+            totals[key[axis]] += count
+        if dim == "year":
+            ordered = sorted(totals)
+        elif dim == "code":
+            ordered = [v for v in ("with_code", "without_code") if v in totals]
+        else:
+            ordered = sorted(totals, key=lambda v: (-totals[v], v))
+        values.append(ordered)
+    index = [{value: i for i, value in enumerate(axis_values)} for axis_values in values]
+    cells = sorted(
+        [index[0][a], index[1][b], count] for (a, b), count in counts.items() if count
+    )
+    return {"dims": list(dims), "values": values, "cells": cells}
+
+
 def derive_insights(stats: Dict) -> List[str]:
     insights: List[str] = []
     year_counts = stats.get("year_counts", [])
@@ -274,17 +478,24 @@ def derive_insights(stats: Dict) -> List[str]:
 
 
 def to_serializable(papers: Iterable[PaperEntry]) -> List[Dict]:
-    return [
-        {
-            "year": paper.year,
-            "title": paper.title,
-            "venue": paper.venue,
-            "paper_url": paper.paper_url,
-            "code_url": paper.code_url,
-            "category": paper.category,
-            "subcategory": paper.subcategory,
-            "has_code": paper.has_code,
-            "domain": infer_domain(paper.title),
-        }
-        for paper in papers
-    ]
+    serialized = []
+    for paper in papers:
+        features = paper_features(paper)
+        serialized.append(
+            {
+                "year": paper.year,
+                "title": paper.title,
+                "venue": paper.venue,
+                "paper_url": paper.paper_url,
+                "code_url": paper.code_url,
+                "category": paper.category,
+                "subcategory": paper.subcategory,
+                "has_code": paper.has_code,
+                "domain": features["domain"],
+                "methods": features["methods"],
+                "venue_stratum": paper.venue_stratum or venue_stratum(paper.venue),
+                "datasets": features["datasets"],
+                "sources": paper.sources,
+            }
+        )
+    return serialized
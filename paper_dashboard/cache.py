@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that identify the caller rather than the resource. They are
+# left out of cache keys so rotating a key or email doesn't invalidate the cache
+# (and so credentials never end up hashed into file names).
+UNKEYED_PARAMS = {"api_key", "mailto"}
+
+DAY = 24 * 60 * 60
+# Per-endpoint freshness. DOI/arXiv singleton records barely change apart from
+# their citation counts, so they live longer than list/search responses whose
+# ranking can shift as OpenAlex ingests new works.
+DEFAULT_TTLS: Dict[str, float] = {
+    "work": 7 * DAY,
+    "filter": 3 * DAY,
+    "search": 1 * DAY,
+}
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    payload: Any
+    stored_at: float
+    endpoint: str
+    validators: Dict[str, str] = field(default_factory=dict)
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.stored_at
+
+
+class ResponseCache:
+    """Content-addressed on-disk cache for JSON API responses.
+
+    Entries are keyed by request URL plus the query parameters that select the
+    returned fields, stored as one JSON file each, and evicted least-recently-
+    used once the directory grows past ``max_bytes``. ``payload`` may be
+    ``None`` to remember a definitive miss (e.g. a DOI OpenAlex doesn't know).
+    With ``refresh`` set, reads always miss but fresh responses are still
+    written back, so a forced refresh re-warms the cache for the next run.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[Mapping[str, float]] = None,
+        refresh: bool = False,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        # ``ttls`` replaces the defaults; ``{}`` keeps every entry fresh.
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # key -> (size in bytes, last access time); built lazily from disk.
+        self._index: Optional[Dict[str, Tuple[int, float]]] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        keyed = {
+            k: str(v) for k, v in (params or {}).items() if k not in UNKEYED_PARAMS
+        }
+        raw = json.dumps([url, sorted(keyed.items())], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Tuple[int, float]]:
+        if self._index is None:
+            index: Dict[str, Tuple[int, float]] = {}
+            total = 0
+            if self.root.exists():
+                for path in self.root.glob("*/*.json"):
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    index[path.stem] = (st.st_size, st.st_mtime)
+                    total += st.st_size
+            self._index = index
+            self._total_bytes = total
+        return self._index
+
+    def peek(self, url: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CacheEntry]:
+        """Return the stored entry regardless of age or ``refresh``."""
+        key = self.key(url, params)
+        path = self._path(key)
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key] = (index[key][0], now)
+        return CacheEntry(
+            payload=raw.get("payload"),
+            stored_at=float(raw.get("stored_at") or 0),
+            endpoint=raw.get("endpoint") or "",
+            validators=raw.get("validators") or {},
+        )
+
+    def get(
+        self, url: str, params: Optional[Mapping[str, Any]], endpoint: str
+    ) -> Optional[CacheEntry]:
+        """Return a fresh entry for this request, or ``None`` on a miss."""
+        entry = None if self.refresh else self.peek(url, params)
+        ttl = self.ttls.get(endpoint)
+        if entry is not None and ttl is not None and entry.age() > ttl:
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def put(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]],
+        endpoint: str,
+        payload: Any,
+        validators: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        key = self.key(url, params)
+        path = self._path(key)
+        body = json.dumps(
+            {
+                "url": url,
+                "endpoint": endpoint,
+                "stored_at": time.time(),
+                "validators": dict(validators or {}),
+                "payload": payload,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_text(body, encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not write cache entry %s: %s", path, exc)
+            return
+        size = len(body.encode("utf-8"))
+        with self._lock:
+            index = self._load_index()
+            previous = index.get(key)
+            if previous:
+                self._total_bytes -= previous[0]
+            index[key] = (size, time.time())
+            self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under 90% of the budget."""
+        index = self._load_index()
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for key in sorted(index, key=lambda k: index[k][1]):
+            if self._total_bytes <= target:
+                break
+            size, _ = index.pop(key)
+            self._total_bytes -= size
+            evicted += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+        if evicted:
+            logger.info("Evicted %d cached responses from %s", evicted, self.root)
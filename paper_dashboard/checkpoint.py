@@ -0,0 +1,83 @@
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CitationCheckpoint:
+    """Append-only JSON-lines log of papers resolved during a citation run.
+
+    Each line records one work's ``citations.citation_key`` and its entry
+    (``null`` when OpenAlex had no trustworthy match), flushed as soon as the
+    paper resolves.
+    A run that dies on a rate limit can then be resumed without re-querying
+    what it already finished. Nothing here is published: the build still only
+    writes data.json once every paper has resolved, and ``complete`` removes
+    the log afterwards.
+
+    The first line is a header holding the ``fingerprint`` of the build that
+    started the log (its output-affecting options). Resuming a log written
+    by a build with a different fingerprint, or one without a header, is
+    refused rather than mixing results from two configurations.
+    """
+
+    def __init__(self, path: Path, fingerprint: str, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, Optional[Dict]] = {}
+        if resume:
+            self._resolved = self._read()
+            logger.info(
+                "Resuming from %s with %d resolved papers", self.path, len(self._resolved)
+            )
+        elif self.path.exists():
+            self.path.unlink()
+
+    def _read(self) -> Dict[str, Optional[Dict]]:
+        resolved: Dict[str, Optional[Dict]] = {}
+        if not self.path.exists():
+            return resolved
+        with self.path.open(encoding="utf-8") as handle:
+            try:
+                header = json.loads(handle.readline())
+            except ValueError:
+                header = None
+            stored = header.get("fingerprint") if isinstance(header, dict) else None
+            if stored != self.fingerprint:
+                raise RuntimeError(
+                    f"Checkpoint {self.path} was written by a build with different options; "
+                    "rerun without --resume to start over."
+                )
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write; skip it.
+                    continue
+                resolved[record["key"]] = record.get("entry")
+        return resolved
+
+    @property
+    def resolved(self) -> Dict[str, Optional[Dict]]:
+        return self._resolved
+
+    def record(self, key: str, entry: Optional[Dict]) -> None:
+        line = json.dumps({"key": key, "entry": entry}, ensure_ascii=False)
+        with self._lock:
+            self._resolved[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            new_log = not self.path.exists()
+            with self.path.open("a", encoding="utf-8") as handle:
+                if new_log:
+                    handle.write(json.dumps({"fingerprint": self.fingerprint}) + "\n")
+                handle.write(line + "\n")
+
+    def complete(self) -> None:
+        with self._lock:
+            if self.path.exists():
+                self.path.unlink()
@@ -1,19 +1,32 @@
 import logging
+import os
 import re
 import time
-from difflib import SequenceMatcher
-from typing import Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from urllib.parse import quote, unquote
 
 import requests
 
+from . import http_client
+from .cache import ResponseCache
+from .checkpoint import CitationCheckpoint
+from .matching import default_matcher, normalize_title
+from .metrics import registry as metrics
 from .parser import PaperEntry
+from .ratelimit import TokenBucket, parse_retry_after
 
 
 logger = logging.getLogger(__name__)
 
-OPENALEX_API_BASE = "https://api.openalex.org/works"
+# Works endpoint; set OPENALEX_API_BASE to replay recorded responses from
+# scripts/standin_server.py instead of querying OpenAlex.
+OPENALEX_API_BASE = os.environ.get(
+    "OPENALEX_API_BASE", "https://api.openalex.org/works"
+)
 # Only request fields we actually consume. NOTE: `host_venue` was REMOVED from
 # the OpenAlex API (superseded by `primary_location`); including it in `select`
 # makes the whole request 400 and silently drops every result. Venue now comes
@@ -34,6 +47,7 @@ ARXIV_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([^?#\s]+)", re.IGNORECASE)
 # Lookbehind avoids grabbing the tail of a longer number; we don't use \b so
 # underscore-prefixed filenames still match.
 ARXIV_ID_RE = re.compile(r"(?<!\d)(\d{4}\.\d{4,5})(v\d+)?")
+ARXIV_DOI_RE = re.compile(r"^10\.48550/arxiv\.(.+)$", re.IGNORECASE)
 ACL_ANTHOLOGY_RE = re.compile(
     r"aclanthology\.org/((?:\d{4}|\d{2})\.[a-z0-9-]+\.\d+)", re.IGNORECASE
 )
@@ -44,6 +58,18 @@ TITLE_STRONG_THRESHOLD = 0.92  # accept on title alone
 TITLE_WITH_YEAR_THRESHOLD = 0.82  # accept if the publication year also lines up
 YEAR_TOLERANCE = 1  # arXiv preprint vs. published version can differ by a year
 
+# DOIs per batched `filter=doi:a|b|c` query. OpenAlex caps OR-filters at 100
+# values; staying at half that keeps URLs short. The page is sized well above
+# the batch because a DOI can occasionally map to more than one work.
+OPENALEX_BATCH_SIZE = 50
+OPENALEX_BATCH_PAGE_SIZE = 200
+
+# A 429 whose Retry-After fits within this window is waited out through the
+# shared limiter; anything longer (e.g. an exhausted daily budget) still fails
+# the build rather than publishing a partial leaderboard.
+MAX_RETRY_AFTER_SECONDS = 60.0
+MAX_RATE_LIMIT_RETRIES = 3
+
 
 class OpenAlexError(RuntimeError):
     """Raised when OpenAlex cannot provide a trustworthy citation result."""
@@ -53,23 +79,8 @@ class OpenAlexRateLimitError(OpenAlexError):
     """Raised when an API budget or request-rate limit is exhausted."""
 
 
-def normalize_title(text: str) -> str:
-    cleaned = re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
-    return " ".join(cleaned.split())
-
-
 def title_similarity(a: str, b: str) -> float:
-    a_norm = normalize_title(a)
-    b_norm = normalize_title(b)
-    if not a_norm or not b_norm:
-        return 0.0
-    if a_norm == b_norm:
-        return 1.0
-    # Substring containment is only meaningful for reasonably long titles;
-    # short titles (e.g. "GNN") would otherwise match almost anything.
-    if min(len(a_norm), len(b_norm)) >= 20 and (a_norm in b_norm or b_norm in a_norm):
-        return 0.95
-    return SequenceMatcher(None, a_norm, b_norm).ratio()
+    return default_matcher.similarity(a, b)
 
 
 def extract_doi(url: Optional[str]) -> Optional[str]:
@@ -114,6 +125,32 @@ def extract_acl_doi(url: Optional[str]) -> Optional[str]:
     return f"10.18653/v1/{match.group(1)}" if match else None
 
 
+def paper_keys(paper: PaperEntry) -> List[str]:
+    """Identity keys of a paper: DOI, arXiv id and normalized title."""
+    keys = []
+    arxiv_id = extract_arxiv_id(paper.paper_url)
+    doi = extract_doi(paper.paper_url)
+    if doi:
+        doi = doi.lower()
+        arxiv_match = ARXIV_DOI_RE.match(doi)
+        if arxiv_match:
+            arxiv_id = arxiv_id or arxiv_match.group(1)
+        else:
+            keys.append(f"doi:{doi}")
+    if arxiv_id:
+        keys.append(f"arxiv:{arxiv_id.lower()}")
+    title = normalize_title(paper.title)
+    if title:
+        keys.append(f"title:{title}")
+    return keys
+
+
+def citation_key(paper: PaperEntry) -> str:
+    """The strongest of ``paper_keys``: DOI, else arXiv id, else normalized title."""
+    keys = paper_keys(paper)
+    return keys[0] if keys else "title:"
+
+
 def _openalex_headers() -> Dict[str, str]:
     return {"User-Agent": "paper-dashboard/1.0 (citation enrichment)"}
 
@@ -156,20 +193,51 @@ def _openalex_year(data: Dict) -> Optional[int]:
 
 
 def _request_openalex(
-    params: Dict[str, str], timeout: int, url: str = OPENALEX_API_BASE
+    params: Dict[str, str],
+    timeout: int,
+    url: Optional[str] = None,
+    cache: Optional[ResponseCache] = None,
+    endpoint: str = "filter",
+    limiter: Optional[TokenBucket] = None,
 ) -> Optional[Dict]:
-    try:
-        resp = requests.get(
-            url,
-            params=params,
-            headers=_openalex_headers(),
-            timeout=timeout,
-        )
-    except requests.RequestException as exc:
-        logger.warning("OpenAlex request failed: %s", exc)
-        return None
-    if resp.status_code == 429:
+    url = url or OPENALEX_API_BASE
+    if cache is not None:
+        cached = cache.get(url, params, endpoint)
+        if cached is not None:
+            metrics.incr("openalex.cache_hits", endpoint)
+            return cached.payload
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        metrics.incr("openalex.requests", endpoint)
+        try:
+            with metrics.timer("openalex.latency", endpoint):
+                resp = http_client.get(
+                    url,
+                    params=params,
+                    headers=_openalex_headers(),
+                    timeout=timeout,
+                )
+        except requests.RequestException as exc:
+            metrics.incr("openalex.status", f"{endpoint}:error")
+            logger.warning("OpenAlex request failed: %s", exc)
+            return None
+        metrics.incr("openalex.status", f"{endpoint}:{resp.status_code}")
+        if resp.status_code != 429:
+            break
         retry_after = resp.headers.get("Retry-After") or "unknown"
+        wait = parse_retry_after(resp.headers.get("Retry-After"))
+        if (
+            limiter is not None
+            and wait is not None
+            and wait <= MAX_RETRY_AFTER_SECONDS
+            and attempt < MAX_RATE_LIMIT_RETRIES
+        ):
+            attempt += 1
+            logger.info("OpenAlex rate limited; backing off %.1fs", wait)
+            limiter.pause(wait)
+            continue
         raise OpenAlexRateLimitError(
             "OpenAlex citation enrichment exhausted its API budget or rate limit "
             f"(retry after {retry_after}s). Configure OPENALEX_API_KEY; anonymous "
@@ -179,16 +247,25 @@ def _request_openalex(
         raise OpenAlexError(
             f"OpenAlex authentication failed ({resp.status_code}). Check OPENALEX_API_KEY."
         )
+    if resp.status_code == 404 and endpoint == "work":
+        # A singleton miss is a definitive answer; remember it so unresolvable
+        # DOIs don't cost a request on every build.
+        if cache is not None:
+            cache.put(url, params, endpoint, None)
+        return None
     if resp.status_code != 200:
         logger.warning(
             "OpenAlex request failed: %s %s", resp.status_code, resp.text[:200]
         )
         return None
     try:
-        return resp.json()
+        payload = resp.json()
     except ValueError:
         logger.warning("OpenAlex returned non-JSON response")
         return None
+    if cache is not None:
+        cache.put(url, params, endpoint, payload)
+    return payload
 
 
 def fetch_openalex_by_filter(
@@ -196,11 +273,15 @@ def fetch_openalex_by_filter(
     email: Optional[str],
     api_key: Optional[str] = None,
     timeout: int = 30,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[TokenBucket] = None,
 ) -> Optional[Dict]:
     params = _openalex_params(email, api_key)
     params["filter"] = filter_value
     params["per-page"] = 1
-    payload = _request_openalex(params, timeout)
+    payload = _request_openalex(
+        params, timeout, cache=cache, endpoint="filter", limiter=limiter
+    )
     if not payload:
         return None
     results = payload.get("results", []) if isinstance(payload, dict) else []
@@ -214,6 +295,8 @@ def fetch_openalex_by_identifier(
     email: Optional[str],
     api_key: Optional[str] = None,
     timeout: int = 30,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[TokenBucket] = None,
 ) -> Optional[Dict]:
     """Fetch a work with OpenAlex's singleton endpoint.
 
@@ -221,33 +304,143 @@ def fetch_openalex_by_identifier(
     list filters, which matters under OpenAlex's credit-based API limits.
     """
     params = _openalex_params(email, api_key)
-    encoded_identifier = quote(identifier, safe=":/")
     return _request_openalex(
         params,
         timeout,
-        url=f"{OPENALEX_API_BASE}/{encoded_identifier}",
+        url=_identifier_url(identifier),
+        cache=cache,
+        endpoint="work",
+        limiter=limiter,
     )
 
 
+def _identifier_url(identifier: str) -> str:
+    return f"{OPENALEX_API_BASE}/{quote(identifier, safe=':/')}"
+
+
+def _bare_doi(value: Optional[str]) -> Optional[str]:
+    """Lower-cased DOI without the https://doi.org/ prefix, as OpenAlex filters use."""
+    if not value:
+        return None
+    value = value.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "doi:"):
+        if value.startswith(prefix):
+            value = value[len(prefix):]
+            break
+    return value or None
+
+
+def prefetch_identifiers(
+    papers: Iterable[PaperEntry],
+    email: Optional[str],
+    api_key: Optional[str] = None,
+    timeout: int = 30,
+    cache: Optional[ResponseCache] = None,
+    batch_size: int = OPENALEX_BATCH_SIZE,
+    limiter: Optional[TokenBucket] = None,
+) -> Dict[str, Optional[Dict]]:
+    """Resolve the DOI lookups of many papers with batched list queries.
+
+    Returns a mapping from each identifier produced by ``_identifier_lookups``
+    to its OpenAlex record, or ``None`` when the singleton cache already knows
+    OpenAlex has no work for that DOI. Identifiers missing from a batch answer,
+    or whose batch failed, are left out, so callers fall back to the singleton
+    endpoint for them. Batch hits are written to ``cache`` under the singleton
+    key, which lets later runs skip the batch entirely.
+    """
+    identifiers: List[str] = []
+    seen = set()
+    for paper in papers:
+        for _, identifier in _identifier_lookups(paper):
+            doi = _bare_doi(identifier)
+            # `,` and `|` are filter syntax; such DOIs go through the singleton path.
+            if identifier not in seen and doi and not set(doi) & {",", "|"}:
+                seen.add(identifier)
+                identifiers.append(identifier)
+
+    resolved: Dict[str, Optional[Dict]] = {}
+    single_params = _openalex_params(email, api_key)
+    pending: List[str] = []
+    for identifier in identifiers:
+        cached = (
+            cache.get(_identifier_url(identifier), single_params, "work")
+            if cache is not None
+            else None
+        )
+        if cached is not None:
+            resolved[identifier] = cached.payload
+        else:
+            pending.append(identifier)
+
+    for start in range(0, len(pending), max(batch_size, 1)):
+        chunk = pending[start : start + max(batch_size, 1)]
+        params = _openalex_params(email, api_key)
+        params["filter"] = "doi:" + "|".join(_bare_doi(i) for i in chunk)
+        params["per-page"] = OPENALEX_BATCH_PAGE_SIZE
+        payload = _request_openalex(
+            params, timeout, endpoint="batch", limiter=limiter
+        )
+        if not isinstance(payload, dict):
+            continue
+        by_doi: Dict[str, Dict] = {}
+        for work in payload.get("results", []):
+            doi = _bare_doi(work.get("doi"))
+            if not doi:
+                continue
+            # Duplicate records for one DOI: keep the best-covered one.
+            current = by_doi.get(doi)
+            if current is None or int(work.get("cited_by_count") or 0) > int(
+                current.get("cited_by_count") or 0
+            ):
+                by_doi[doi] = work
+        for identifier in chunk:
+            data = by_doi.get(_bare_doi(identifier))
+            # A batch only matches a work's canonical DOI, while the singleton
+            # endpoint also resolves merged ones (e.g. an arXiv DOI folded into
+            # the publisher record), so a batch miss is not a real miss: leave
+            # it to the singleton lookup and never cache it.
+            if data is None:
+                continue
+            resolved[identifier] = data
+            if cache is not None:
+                cache.put(_identifier_url(identifier), single_params, "work", data)
+    logger.info(
+        "Prefetched %d DOI lookups (%d from cache, %d batched requests)",
+        len(identifiers),
+        len(identifiers) - len(pending),
+        -(-len(pending) // max(batch_size, 1)),
+    )
+    return resolved
+
+
 def search_openalex_by_title(
     title: str,
     year: Optional[int],
     email: Optional[str],
     api_key: Optional[str] = None,
     timeout: int = 30,
+    cache: Optional[ResponseCache] = None,
+    limiter: Optional[TokenBucket] = None,
 ) -> Optional[Dict]:
     params = _openalex_params(email, api_key)
     params["search"] = title
     params["per-page"] = 5
-    payload = _request_openalex(params, timeout)
+    payload = _request_openalex(
+        params, timeout, cache=cache, endpoint="search", limiter=limiter
+    )
     if not payload:
         return None
     candidates = payload.get("results", []) if isinstance(payload, dict) else []
+    # Candidates that cannot reach the lower threshold are never accepted, so
+    # the matcher may skip exact scoring for them.
+    scores = default_matcher.bulk_similarity(
+        title,
+        [cand.get("display_name") or "" for cand in candidates],
+        floor=TITLE_WITH_YEAR_THRESHOLD,
+    )
     best = None
     best_rank = (0.0, False, False, 0)
-    for cand in candidates:
-        cand_title = cand.get("display_name") or ""
-        score = title_similarity(title, cand_title)
+    for cand, score in zip(candidates, scores):
         cand_year = _openalex_year(cand)
         year_ok = (
             year is not None
@@ -303,9 +496,56 @@ def build_openalex_entry(paper: PaperEntry, data: Dict, match: str) -> Dict:
         "doi": data.get("doi"),
         "citation_source": "OpenAlex",
         "match_method": match,
+        "citation_updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def build_miss_entry(paper: PaperEntry) -> Dict:
+    """Record that OpenAlex had no trustworthy match for ``paper`` just now."""
+    return {
+        "title": paper.title,
+        "year": paper.year,
+        "paper_url": paper.paper_url,
+        "citation_updated_at": datetime.now(timezone.utc).isoformat(),
     }
 
 
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _reusable_entry(paper: PaperEntry, entry: Dict, cutoff: datetime) -> bool:
+    """Whether a previous build's entry still describes this paper and is fresh."""
+    updated_at = _parse_timestamp(entry.get("citation_updated_at"))
+    if updated_at is None or updated_at < cutoff:
+        return False
+    # A changed link or year means the row was edited upstream; re-resolve it.
+    if paper.paper_url and entry.get("paper_url") != paper.paper_url:
+        return False
+    if paper.year and entry.get("year") != paper.year:
+        return False
+    return True
+
+
+def oldest_update(entries: Iterable[Dict]) -> Optional[str]:
+    """The earliest ``citation_updated_at`` among ``entries``, if any."""
+    stamped = [
+        (updated_at, entry["citation_updated_at"])
+        for entry in entries
+        for updated_at in [_parse_timestamp(entry.get("citation_updated_at"))]
+        if updated_at is not None
+    ]
+    return min(stamped)[1] if stamped else None
+
+
 def _is_published_record(data: Dict) -> bool:
     doi = (data.get("doi") or "").lower()
     return bool(doi and "10.48550/arxiv" not in doi)
@@ -382,40 +622,59 @@ def fetch_citation_for_paper(
     email: Optional[str],
     api_key: Optional[str] = None,
     timeout: int = 30,
+    cache: Optional[ResponseCache] = None,
+    prefetched: Optional[Mapping[str, Optional[Dict]]] = None,
+    limiter: Optional[TokenBucket] = None,
 ) -> Optional[Dict]:
     """Resolve a single paper to an OpenAlex record.
 
     Publisher DOI matches are authoritative. ArXiv DOI matches are cross-checked
     against a verified title search because OpenAlex may keep a separate,
     zero-citation DataCite record alongside the cited publisher record.
+    Identifiers already answered by ``prefetch_identifiers`` skip the request.
     """
     matches: List[Tuple[str, Dict]] = []
     for method, identifier in _identifier_lookups(paper):
-        data = fetch_openalex_by_identifier(
-            identifier,
-            email=email,
-            api_key=api_key,
-            timeout=timeout,
-        )
+        if prefetched is not None and identifier in prefetched:
+            metrics.incr("openalex.lookups_prefetched", method)
+            data = prefetched[identifier]
+        else:
+            metrics.incr("openalex.lookups", method)
+            with metrics.timer("openalex.lookup_latency", method):
+                data = fetch_openalex_by_identifier(
+                    identifier,
+                    email=email,
+                    api_key=api_key,
+                    timeout=timeout,
+                    cache=cache,
+                    limiter=limiter,
+                )
         if data and data.get("cited_by_count") is not None:
             if method in {"doi", "acl-doi"}:
+                metrics.incr("openalex.matched", method)
                 return build_openalex_entry(paper, data, method)
             matches.append((method, data))
 
-    data = search_openalex_by_title(
-        paper.title,
-        paper.year,
-        email=email,
-        api_key=api_key,
-        timeout=timeout,
-    )
+    metrics.incr("openalex.lookups", "title")
+    with metrics.timer("openalex.lookup_latency", "title"):
+        data = search_openalex_by_title(
+            paper.title,
+            paper.year,
+            email=email,
+            api_key=api_key,
+            timeout=timeout,
+            cache=cache,
+            limiter=limiter,
+        )
     if data and data.get("cited_by_count") is not None:
         matches.append(("title", data))
 
     selected = _select_preferred_match(paper, matches)
     if not selected:
+        metrics.incr("openalex.matched", "none")
         return None
     method, data = selected
+    metrics.incr("openalex.matched", method)
     return build_openalex_entry(paper, data, method)
 
 
@@ -426,14 +685,22 @@ def fetch_top_cited(
     top_k: int = 10,
     limit: Optional[int] = None,
     sleep_seconds: float = 0.0,
+    cache: Optional[ResponseCache] = None,
+    max_workers: int = 1,
+    limiter: Optional[TokenBucket] = None,
 ) -> Tuple[List[Dict], Optional[str], Optional[str]]:
-    entries, queried = fetch_all_citations(
+    results = fetch_all_citations(
         papers,
         openalex_email=openalex_email,
         openalex_api_key=openalex_api_key,
         limit=limit,
         sleep_seconds=sleep_seconds,
+        cache=cache,
+        max_workers=max_workers,
+        limiter=limiter,
     )
+    entries = [entry for _, entry, _ in results if entry is not None]
+    queried = len(results)
     if entries:
         note = None
         if len(entries) < queried:
@@ -443,36 +710,187 @@ def fetch_top_cited(
     return [], "No citation data returned from OpenAlex.", None
 
 
+def unique_papers(
+    papers: Iterable[PaperEntry], limit: Optional[int] = None
+) -> List[PaperEntry]:
+    """First occurrence of every ``citation_key``, capped at ``limit``."""
+    targets: List[PaperEntry] = []
+    seen_targets = set()
+    for paper in papers:
+        target_key = citation_key(paper)
+        if target_key in seen_targets:
+            continue
+        if limit is not None and len(targets) >= limit:
+            break
+        seen_targets.add(target_key)
+        targets.append(paper)
+    return targets
+
+
+@dataclass
+class CitationResults:
+    paper_entries: List[Dict]
+    queried: int
+    by_title: Dict[str, Dict]
+    # ``build_miss_entry`` records for papers OpenAlex did not match.
+    paper_misses: List[Dict] = field(default_factory=list)
+    # The same for ``extra`` works that are not also papers, e.g. surveys.
+    extra_entries: List[Dict] = field(default_factory=list)
+    extra_misses: List[Dict] = field(default_factory=list)
+
+    def lookup(self, title: str) -> Optional[Dict]:
+        return self.by_title.get(normalize_title(title))
+
+
+def resolve_citation_queue(
+    papers: Iterable[PaperEntry],
+    extra: Iterable[PaperEntry] = (),
+    limit: Optional[int] = None,
+    **options,
+) -> CitationResults:
+    """Resolve papers and extra works (e.g. surveys) as one deduplicated batch.
+
+    Works are keyed by ``citation_key``, so a DOI or arXiv id merges them
+    even when the titles differ, and two works sharing a title stay apart.
+    ``limit`` caps the unique papers only; ``extra`` entries are always
+    resolved. A work listed in both is queried once, and both consumers read
+    it back through ``CitationResults.lookup``. ``options`` are passed on to
+    ``fetch_all_citations``; its ``previous`` and ``previous_misses`` may
+    hold extra works too.
+    """
+    paper_targets = unique_papers(papers, limit)
+    works = list(paper_targets) + list(extra)
+    paper_keys = {citation_key(paper) for paper in paper_targets}
+    results = CitationResults(paper_entries=[], queried=len(paper_targets), by_title={})
+    by_key: Dict[str, Dict] = {}
+    for work, entry, miss in fetch_all_citations(works, **options):
+        key = citation_key(work)
+        if entry is not None:
+            by_key[key] = entry
+            (results.paper_entries if key in paper_keys else results.extra_entries).append(entry)
+        else:
+            (results.paper_misses if key in paper_keys else results.extra_misses).append(miss)
+    # Every queued title finds its work's entry, also when a DOI or arXiv id
+    # merged it into a work listed under another title.
+    for work in works:
+        entry = by_key.get(citation_key(work))
+        if entry is not None:
+            results.by_title.setdefault(normalize_title(work.title), entry)
+    return results
+
+
 def fetch_all_citations(
     papers: Iterable[PaperEntry],
     openalex_email: Optional[str] = None,
     openalex_api_key: Optional[str] = None,
     limit: Optional[int] = None,
     sleep_seconds: float = 0.0,
-) -> Tuple[List[Dict], int]:
+    cache: Optional[ResponseCache] = None,
+    batch_size: int = OPENALEX_BATCH_SIZE,
+    max_workers: int = 1,
+    limiter: Optional[TokenBucket] = None,
+    previous: Optional[Iterable[Dict]] = None,
+    max_age: Optional[timedelta] = None,
+    checkpoint: Optional[CitationCheckpoint] = None,
+    previous_misses: Optional[Iterable[Dict]] = None,
+) -> List[Tuple[PaperEntry, Optional[Dict], Optional[Dict]]]:
     """Resolve citation metadata for every unique work.
 
-    A failed rate-limited request raises instead of returning a misleading
-    partial leaderboard. Duplicate rows are resolved once and then reused.
+    Returns ``(work, entry, miss)`` per unique work in input order. Fresh
+    ``previous`` results and ``checkpoint`` records are reused as-is.
     """
-    openalex_results: List[Dict] = []
-    queried = 0
-    seen_targets = set()
-    for paper in papers:
-        target_key = normalize_title(paper.title)
-        if target_key in seen_targets:
-            continue
-        if limit is not None and queried >= limit:
-            break
-        seen_targets.add(target_key)
-        queried += 1
+    targets = unique_papers(papers, limit)
+
+    reused: Dict[int, Optional[Dict]] = {}
+    reused_misses: Dict[int, Dict] = {}
+    if checkpoint is not None:
+        for index, paper in enumerate(targets):
+            key = citation_key(paper)
+            if key in checkpoint.resolved:
+                entry = checkpoint.resolved[key]
+                reused[index] = dict(entry, title=paper.title) if entry else None
+    if max_age is not None and (previous is not None or previous_misses is not None):
+        cutoff = datetime.now(timezone.utc) - max_age
+        # Several works may share a title; ``_reusable_entry`` tells them apart.
+        previous_by_title: Dict[str, List[Dict]] = {}
+        for e in previous or ():
+            previous_by_title.setdefault(normalize_title(e["title"]), []).append(e)
+        misses_by_title: Dict[str, List[Dict]] = {}
+        for e in previous_misses or ():
+            misses_by_title.setdefault(normalize_title(e["title"]), []).append(e)
+        for index, paper in enumerate(targets):
+            if index in reused:
+                continue
+            key = normalize_title(paper.title)
+            entry = next(
+                (e for e in previous_by_title.get(key, ()) if _reusable_entry(paper, e, cutoff)),
+                None,
+            )
+            if entry is not None:
+                reused[index] = dict(entry, title=paper.title)
+                continue
+            miss = next(
+                (e for e in misses_by_title.get(key, ()) if _reusable_entry(paper, e, cutoff)),
+                None,
+            )
+            if miss is not None:
+                reused[index] = None
+                reused_misses[index] = dict(miss, title=paper.title)
+    if reused:
+        logger.info(
+            "Reusing %d citation results (%d unmatched); resolving %d papers",
+            len(reused),
+            sum(1 for entry in reused.values() if entry is None),
+            len(targets) - len(reused),
+        )
+    pending = [paper for index, paper in enumerate(targets) if index not in reused]
+
+    prefetched = None
+    if batch_size and pending:
+        prefetched = prefetch_identifiers(
+            pending,
+            email=openalex_email,
+            api_key=openalex_api_key,
+            cache=cache,
+            batch_size=batch_size,
+            limiter=limiter,
+        )
+
+    def resolve(paper: PaperEntry) -> Optional[Dict]:
         entry = fetch_citation_for_paper(
             paper,
             email=openalex_email,
             api_key=openalex_api_key,
+            cache=cache,
+            prefetched=prefetched,
+            limiter=limiter,
         )
+        if checkpoint is not None:
+            checkpoint.record(citation_key(paper), entry)
+        return entry
+
+    resolved: List[Optional[Dict]] = []
+    if max_workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(resolve, paper) for paper in pending]
+            try:
+                resolved = [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    else:
+        for paper in pending:
+            resolved.append(resolve(paper))
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+
+    fresh = iter(resolved)
+    results: List[Tuple[PaperEntry, Optional[Dict], Optional[Dict]]] = []
+    for index, paper in enumerate(targets):
+        entry = reused[index] if index in reused else next(fresh)
         if entry is not None:
-            openalex_results.append(entry)
-        if sleep_seconds:
-            time.sleep(sleep_seconds)
-    return openalex_results, queried
+            results.append((paper, entry, None))
+        else:
+            results.append((paper, None, reused_misses.get(index) or build_miss_entry(paper)))
+    return results
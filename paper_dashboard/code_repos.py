@@ -1,14 +1,133 @@
 import logging
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from urllib.parse import urlparse
 
 import requests
 
+from . import http_client
+from .cache import ResponseCache
+from .metrics import registry as metrics
+from .ratelimit import parse_retry_after
+
 logger = logging.getLogger(__name__)
 
-GITHUB_API = "https://api.github.com"
+# REST root, also used to derive the GraphQL endpoint. GITHUB_API_BASE
+# redirects both for offline runs.
+GITHUB_API = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
+# Repositories per GraphQL query; each one is an aliased `repository` field.
+GRAPHQL_BATCH_SIZE = 100
+GRAPHQL_REPO_FIELDS = """
+fragment RepoFields on Repository {
+  nameWithOwner
+  url
+  stargazerCount
+  primaryLanguage { name }
+  repositoryTopics(first: 20) { nodes { topic { name } } }
+  languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+    edges { size node { name } }
+  }
+}
+"""
+
+
+class GitHubRateLimitError(requests.RequestException):
+    """Raised when GitHub's rate limit cannot be waited out within budget."""
+
+
+class GitHubScheduler:
+    """Paces GitHub REST calls to the budget the API reports.
+
+    Every response updates the primary budget from ``X-RateLimit-Remaining``
+    / ``X-RateLimit-Reset``; a secondary-limit ``Retry-After`` blocks all
+    callers for that long. When the budget is spent, requests wait for the
+    reset if it is at most ``max_wait`` seconds away. Otherwise the scheduler
+    is marked exhausted and every further request fails fast with
+    ``GitHubRateLimitError``, so callers can fall back instead of blocking.
+    ``min_interval`` spaces consecutive requests to stay clear of the
+    secondary limits.
+    """
+
+    def __init__(
+        self,
+        max_wait: float = 60.0,
+        min_interval: float = 0.0,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_wait = max_wait
+        self.min_interval = min_interval
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.exhausted = False
+        self._blocked_until = 0.0
+        self._next_slot = 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def spawn(self) -> "GitHubScheduler":
+        """A scheduler with the same limits for another budget.
+
+        GitHub meters GraphQL separately from the REST core budget, so the
+        two need separate state.
+        """
+        return GitHubScheduler(self.max_wait, self.min_interval, self._clock, self._sleep)
+
+    def update(self, remaining: Optional[int], reset_at: Optional[float]) -> None:
+        with self._lock:
+            if remaining is not None:
+                self.remaining = remaining
+            if reset_at is not None:
+                self.reset_at = reset_at
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.exhausted:
+                raise GitHubRateLimitError("GitHub rate limit exhausted for this build")
+            now = self._clock()
+            if self.reset_at is not None and now >= self.reset_at:
+                self.remaining = None
+                self.reset_at = None
+            wait = max(0.0, self._blocked_until - now)
+            if self.remaining is not None and self.remaining <= 0 and self.reset_at:
+                wait = max(wait, self.reset_at - now)
+            if wait > self.max_wait:
+                self.exhausted = True
+                raise GitHubRateLimitError(
+                    f"GitHub rate limit resets in {wait:.0f}s (max wait {self.max_wait:.0f}s)"
+                )
+            start = max(now + wait, self._next_slot)
+            self._next_slot = start + self.min_interval
+            if self.remaining is not None:
+                # Reserve a request so concurrent callers don't overdraw.
+                self.remaining -= 1
+            wait = start - now
+        if wait > 0:
+            self._sleep(wait)
+
+    def observe(self, resp: requests.Response) -> bool:
+        """Record rate-limit headers; return True if ``resp`` was rate limited."""
+        headers = resp.headers
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        self.update(
+            int(remaining) if remaining and remaining.isdigit() else None,
+            float(reset) if reset and reset.isdigit() else None,
+        )
+        if resp.status_code not in (403, 429):
+            return False
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, self._clock() + retry_after)
+            return True
+        return remaining == "0"
 
 
 @dataclass
@@ -35,39 +154,277 @@ def extract_repo_full_name(url: str) -> Optional[str]:
     return f"{owner}/{repo}"
 
 
-def unique_github_repos(urls: Iterable[str]) -> List[str]:
+def unique_github_repos(
+    urls: Iterable[str], aliases: Optional[Mapping[str, str]] = None
+) -> List[str]:
+    """Distinct owner/repo names, in first-seen order.
+
+    GitHub names are case-insensitive, and ``aliases`` (lower-cased old name
+    -> current name) folds renamed repos into their canonical name, so a
+    project linked under two names is fetched once.
+    """
     names = []
     seen = set()
     for url in urls:
         name = extract_repo_full_name(url)
-        if name and name not in seen:
-            seen.add(name)
+        if not name:
+            continue
+        name = (aliases or {}).get(name.lower(), name)
+        if name.lower() not in seen:
+            seen.add(name.lower())
             names.append(name)
     return names
 
 
-def _github_get(path: str, token: Optional[str]) -> Optional[dict]:
+def _github_endpoint(path: str) -> str:
+    """Metric label for a REST path, e.g. repos/a/b/languages -> languages."""
+    parts = path.split("/")
+    return parts[3] if len(parts) > 3 else parts[0].rstrip("s") or path
+
+
+def _github_get(
+    path: str,
+    token: Optional[str],
+    cache: Optional[ResponseCache] = None,
+    scheduler: Optional[GitHubScheduler] = None,
+) -> Optional[dict]:
+    """GET a REST resource, revalidating any cached copy with its ETag.
+
+    GitHub answers a matching ``If-None-Match`` with 304 Not Modified, which
+    does not count against the rate limit, so unchanged repos cost almost
+    nothing on repeat builds.
+    """
+    url = f"{GITHUB_API}/{path}"
     headers = {"Accept": "application/vnd.github+json", "User-Agent": "paper-dashboard"}
     if token:
         headers["Authorization"] = f"Bearer {token}"
-    resp = requests.get(f"{GITHUB_API}/{path}", headers=headers, timeout=10)
+    cached = cache.peek(url) if cache is not None else None
+    if cached is not None and cached.payload is not None:
+        if cached.validators.get("etag"):
+            headers["If-None-Match"] = cached.validators["etag"]
+        if cached.validators.get("last_modified"):
+            headers["If-Modified-Since"] = cached.validators["last_modified"]
+    endpoint = _github_endpoint(path)
+    attempt = 0
+    while True:
+        if scheduler is not None:
+            scheduler.before_request()
+        metrics.incr("github.requests", endpoint)
+        try:
+            with metrics.timer("github.latency", endpoint):
+                resp = http_client.get(url, headers=headers, timeout=10)
+        except requests.RequestException:
+            metrics.incr("github.status", f"{endpoint}:error")
+            raise
+        metrics.incr("github.status", f"{endpoint}:{resp.status_code}")
+        if scheduler is None or not scheduler.observe(resp):
+            break
+        attempt += 1
+        if attempt > 3:
+            raise GitHubRateLimitError(f"GitHub kept rate limiting {path}")
+        logger.info("GitHub rate limited %s; waiting for the scheduler", path)
+    if resp.status_code == 304 and cached is not None:
+        return cached.payload
     if resp.status_code == 404:
         return None
     resp.raise_for_status()
-    return resp.json()
+    payload = resp.json()
+    if cache is not None:
+        validators = {}
+        if resp.headers.get("ETag"):
+            validators["etag"] = resp.headers["ETag"]
+        if resp.headers.get("Last-Modified"):
+            validators["last_modified"] = resp.headers["Last-Modified"]
+        if validators:
+            cache.put(url, None, "github", payload, validators=validators)
+    return payload
+
+
+def _graphql_rate_limited(payload: dict) -> bool:
+    """GraphQL reports an exhausted primary budget as a 200 with an error."""
+    return any(
+        error.get("type") == "RATE_LIMITED" for error in payload.get("errors") or []
+    )
+
+
+def _github_graphql(
+    query: str,
+    variables: Dict[str, str],
+    token: str,
+    scheduler: Optional[GitHubScheduler] = None,
+) -> dict:
+    """POST one GraphQL query, paced by ``scheduler`` like ``_github_get``."""
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "paper-dashboard",
+        "Authorization": f"Bearer {token}",
+    }
+    attempt = 0
+    while True:
+        if scheduler is not None:
+            scheduler.before_request()
+        metrics.incr("github.requests", "graphql")
+        try:
+            with metrics.timer("github.latency", "graphql"):
+                resp = http_client.post(
+                    f"{GITHUB_API}/graphql",
+                    json={"query": query, "variables": variables},
+                    headers=headers,
+                    timeout=30,
+                )
+        except requests.RequestException:
+            metrics.incr("github.status", "graphql:error")
+            raise
+        metrics.incr("github.status", f"graphql:{resp.status_code}")
+        limited = scheduler is not None and scheduler.observe(resp)
+        payload = None
+        if not limited and resp.status_code == 200:
+            payload = resp.json()
+            if scheduler is not None and _graphql_rate_limited(payload):
+                scheduler.update(0, None)
+                limited = True
+        if not limited:
+            break
+        attempt += 1
+        if attempt > 3:
+            raise GitHubRateLimitError("GitHub kept rate limiting GraphQL")
+        logger.info("GitHub rate limited a GraphQL batch; waiting for the scheduler")
+    resp.raise_for_status()
+    return payload if payload is not None else resp.json()
+
+
+def _graphql_batch_query(names: List[str]) -> Tuple[str, Dict[str, str]]:
+    declarations = []
+    fields = []
+    variables: Dict[str, str] = {}
+    for index, name in enumerate(names):
+        owner, repo = name.split("/", 1)
+        variables[f"o{index}"] = owner
+        variables[f"n{index}"] = repo
+        declarations.append(f"$o{index}: String!, $n{index}: String!")
+        fields.append(
+            f"  r{index}: repository(owner: $o{index}, name: $n{index}) {{ ...RepoFields }}"
+        )
+    query = (
+        f"query({', '.join(declarations)}) {{\n"
+        + "\n".join(fields)
+        + "\n}\n"
+        + GRAPHQL_REPO_FIELDS
+    )
+    return query, variables
 
 
-def fetch_repo_metadata(repo_full_name: str, token: Optional[str]) -> Optional[RepoMetadata]:
+def _metadata_from_graphql(name: str, node: dict) -> RepoMetadata:
+    languages = {
+        edge["node"]["name"]: int(edge["size"])
+        for edge in (node.get("languages") or {}).get("edges") or []
+    }
+    topics = [
+        topic_node["topic"]["name"]
+        for topic_node in (node.get("repositoryTopics") or {}).get("nodes") or []
+    ]
+    return RepoMetadata(
+        full_name=node.get("nameWithOwner") or name,
+        url=node.get("url"),
+        stars=node.get("stargazerCount", 0),
+        language=(node.get("primaryLanguage") or {}).get("name"),
+        topics=topics,
+        languages=languages,
+    )
+
+
+def fetch_metadata_graphql(
+    repos: Iterable[str],
+    token: str,
+    batch_size: int = GRAPHQL_BATCH_SIZE,
+    max_workers: int = 1,
+    scheduler: Optional[GitHubScheduler] = None,
+) -> Tuple[Dict[str, Optional[RepoMetadata]], List[str]]:
+    """Fetch repository metadata for many repos per GraphQL query.
+
+    Batches are issued in input order, so callers put their most important
+    repos first, on up to ``max_workers`` threads, each paced by
+    ``scheduler``, which tracks the GraphQL budget from GitHub's rate-limit
+    headers. Returns the resolved repos (``None`` for repos GitHub reports as
+    missing, mirroring the REST 404 path) and the names that still need the
+    REST fallback because their batch failed, ran out of GraphQL budget, or
+    GitHub returned another error.
+    """
+    names = list(repos)
+    resolved: Dict[str, Optional[RepoMetadata]] = {}
+    fallback: List[str] = []
+    batches = [names[start : start + batch_size] for start in range(0, len(names), batch_size)]
+
+    def fetch_batch(batch: List[str]) -> Optional[dict]:
+        query, variables = _graphql_batch_query(batch)
+        try:
+            return _github_graphql(query, variables, token, scheduler)
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("GraphQL batch failed, falling back to REST: %s", exc)
+            return None
+
+    if max_workers > 1 and len(batches) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            payloads = list(pool.map(fetch_batch, batches))
+    else:
+        payloads = [fetch_batch(batch) for batch in batches]
+    for batch, payload in zip(batches, payloads):
+        if payload is None:
+            fallback.extend(batch)
+            continue
+        data = payload.get("data") or {}
+        errors_by_alias: Dict[str, str] = {}
+        for error in payload.get("errors") or []:
+            path = error.get("path") or []
+            if path:
+                errors_by_alias[path[0]] = error.get("type") or "ERROR"
+        for index, name in enumerate(batch):
+            alias = f"r{index}"
+            node = data.get(alias)
+            if node:
+                resolved[name] = _metadata_from_graphql(name, node)
+            elif errors_by_alias.get(alias) == "NOT_FOUND":
+                resolved[name] = None
+            else:
+                fallback.append(name)
+    return resolved, fallback
+
+
+def fetch_rate_limit(token: Optional[str], scheduler: GitHubScheduler) -> None:
+    """Prime ``scheduler`` with the core REST budget (this call is free)."""
     try:
-        meta = _github_get(f"repos/{repo_full_name}", token)
+        data = _github_get("rate_limit", token)
+    except requests.RequestException as exc:
+        logger.info("Could not read GitHub rate limit: %s", exc)
+        return
+    core = ((data or {}).get("resources") or {}).get("core") or {}
+    if "remaining" in core:
+        scheduler.update(int(core["remaining"]), float(core.get("reset") or 0) or None)
+
+
+def fetch_repo_metadata(
+    repo_full_name: str,
+    token: Optional[str],
+    cache: Optional[ResponseCache] = None,
+    scheduler: Optional[GitHubScheduler] = None,
+) -> Optional[RepoMetadata]:
+    """Fetch one repo over REST; ``GitHubRateLimitError`` propagates."""
+    try:
+        meta = _github_get(f"repos/{repo_full_name}", token, cache, scheduler)
         if not meta:
             return None
-        languages = _github_get(f"repos/{repo_full_name}/languages", token) or {}
+        languages = (
+            _github_get(f"repos/{repo_full_name}/languages", token, cache, scheduler)
+            or {}
+        )
+    except GitHubRateLimitError:
+        raise
     except requests.RequestException as exc:
         logger.warning("Skipping repo %s: %s", repo_full_name, exc)
         return None
     return RepoMetadata(
-        full_name=repo_full_name,
+        # Renamed repos redirect; keep the name GitHub reports now.
+        full_name=meta.get("full_name") or repo_full_name,
         url=meta.get("html_url"),
         stars=meta.get("stargazers_count", 0),
         language=meta.get("language"),
@@ -76,13 +433,109 @@ def fetch_repo_metadata(repo_full_name: str, token: Optional[str]) -> Optional[R
     )
 
 
-def fetch_all_metadata(repos: Iterable[str], token: Optional[str]) -> List[RepoMetadata]:
-    metadata: List[RepoMetadata] = []
-    for name in repos:
-        repo_meta = fetch_repo_metadata(name, token)
-        if repo_meta:
-            metadata.append(repo_meta)
-    return metadata
+def _is_cached(cache: Optional[ResponseCache], name: str) -> bool:
+    """Whether ``cache`` holds an ETag-validated REST copy of the repo."""
+    if cache is None:
+        return False
+    entry = cache.peek(f"{GITHUB_API}/repos/{name}")
+    return entry is not None and entry.payload is not None and bool(entry.validators.get("etag"))
+
+
+def fetch_all_metadata(
+    repos: Iterable[str],
+    token: Optional[str],
+    use_graphql: bool = True,
+    cache: Optional[ResponseCache] = None,
+    max_workers: int = 1,
+    scheduler: Optional[GitHubScheduler] = None,
+    priority: Optional[Mapping[str, int]] = None,
+    fallback: Optional[Mapping[str, RepoMetadata]] = None,
+    renames: Optional[Dict[str, str]] = None,
+    graphql_scheduler: Optional[GitHubScheduler] = None,
+) -> List[RepoMetadata]:
+    """Fetch metadata for every repo, in input order.
+
+    Highest ``priority`` first; unfetched repos keep their ``fallback``
+    metadata and renamed ones are reported once under the new name.
+    """
+    names = list(repos)
+    ordered = sorted(names, key=lambda name: -priority.get(name, 0)) if priority else names
+    resolved: Dict[str, Optional[RepoMetadata]] = {}
+    pending = ordered
+    if token and use_graphql and names:
+        if cache is not None and scheduler is not None:
+            fetch_rate_limit(token, scheduler)
+        budget = scheduler.remaining if scheduler is not None else None
+        if cache is not None and budget is not None and budget >= 2 * len(ordered):
+            warm, cold = ordered, []
+        else:
+            warm = [name for name in ordered if _is_cached(cache, name)]
+            cold = [name for name in ordered if not _is_cached(cache, name)]
+        if graphql_scheduler is None and scheduler is not None:
+            graphql_scheduler = scheduler.spawn()
+        resolved, leftover = fetch_metadata_graphql(
+            cold, token, max_workers=max_workers, scheduler=graphql_scheduler
+        )
+        pending = warm + leftover
+        if priority:
+            pending = sorted(pending, key=lambda name: -priority.get(name, 0))
+        if warm:
+            logger.info("Fetching %d repos over REST with ETag revalidation", len(warm))
+    if scheduler is not None and pending:
+        fetch_rate_limit(token, scheduler)
+        needed = 2 * len(pending)
+        if scheduler.remaining is not None and scheduler.remaining < needed:
+            logger.warning(
+                "GitHub budget (%d requests) is below the %d needed; "
+                "fetching the highest-priority repos first",
+                scheduler.remaining,
+                needed,
+            )
+
+    unfetched: List[str] = []
+
+    def fetch_one(name: str) -> Optional[RepoMetadata]:
+        try:
+            return fetch_repo_metadata(name, token, cache, scheduler)
+        except GitHubRateLimitError:
+            unfetched.append(name)
+            return None
+
+    if max_workers > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            fetched = list(pool.map(fetch_one, pending))
+    else:
+        fetched = [fetch_one(name) for name in pending]
+    resolved.update(zip(pending, fetched))
+
+    if unfetched:
+        stale = [name for name in unfetched if fallback and name in fallback]
+        for name in stale:
+            resolved[name] = fallback[name]
+        logger.warning(
+            "GitHub rate limit left %d repos unfetched; reused previous metadata "
+            "for %d and dropped %d",
+            len(unfetched),
+            len(stale),
+            len(unfetched) - len(stale),
+        )
+        metrics.incr("github.unfetched", "stale", len(stale))
+        metrics.incr("github.unfetched", "dropped", len(unfetched) - len(stale))
+
+    results: List[RepoMetadata] = []
+    seen = set()
+    for name in names:
+        repo = resolved.get(name)
+        if not repo:
+            continue
+        if repo.full_name != name:
+            logger.info("GitHub repo %s is now %s", name, repo.full_name)
+            if renames is not None:
+                renames[name] = repo.full_name
+        if repo.full_name.lower() not in seen:
+            seen.add(repo.full_name.lower())
+            results.append(repo)
+    return results
 
 
 def aggregate_languages(repos: Iterable[RepoMetadata]) -> List[Dict[str, int]]:
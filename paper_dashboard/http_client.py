@@ -0,0 +1,131 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+logger = logging.getLogger(__name__)
+
+# Transient upstream failures worth retrying. 429 is deliberately absent: rate
+# limits carry their own Retry-After semantics and are handled by the callers.
+RETRY_STATUSES = {500, 502, 503, 504}
+# Upper bound on simultaneous requests per host, shared by every thread.
+DEFAULT_HOST_LIMITS: Dict[str, int] = {
+    "api.openalex.org": 10,
+    "api.github.com": 8,
+}
+DEFAULT_HOST_LIMIT = 8
+
+
+class HttpClient:
+    """Pooled HTTP client shared by the OpenAlex and GitHub fetchers.
+
+    Each host gets its own keep-alive ``requests.Session`` so TLS connections
+    are reused across calls, a semaphore capping in-flight requests, and
+    retries of connection errors and 5xx responses with full-jitter
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        host_limits: Optional[Mapping[str, int]] = None,
+        default_host_limit: int = DEFAULT_HOST_LIMIT,
+    ) -> None:
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.host_limits = dict(DEFAULT_HOST_LIMITS)
+        if host_limits:
+            self.host_limits.update(host_limits)
+        self.default_host_limit = default_host_limit
+        self._sessions: Dict[str, requests.Session] = {}
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host: str):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                limit = self.host_limits.get(host, self.default_host_limit)
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=limit)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._semaphores[host] = threading.BoundedSemaphore(limit)
+            return session, self._semaphores[host]
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        time.sleep(delay)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlparse(url).netloc
+        session, semaphore = self._host_state(host)
+        attempt = 0
+        while True:
+            try:
+                with semaphore:
+                    resp = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= self.max_retries:
+                    raise
+                logger.info("Retrying %s after %s", host, exc)
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return resp
+                logger.info("Retrying %s after HTTP %s", host, resp.status_code)
+                resp.close()
+            self._sleep_before_retry(attempt)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._semaphores.clear()
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> HttpClient:
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def configure(**kwargs) -> HttpClient:
+    """Replace the shared client, e.g. to change retries or per-host caps."""
+    global _default_client
+    with _default_lock:
+        if _default_client is not None:
+            _default_client.close()
+        _default_client = HttpClient(**kwargs)
+        return _default_client
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return default_client().get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return default_client().post(url, **kwargs)
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """sha256 of a file's bytes, or ``None`` if it does not exist."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class BuildManifest:
+    """What the last successful build was made from.
+
+    Records the git blob id of every source README, a fingerprint of the
+    output-affecting options and a digest of the data.json it wrote. A
+    scheduled build whose sources and options both match, and whose output
+    is still the file that build produced, has nothing new to parse, so it
+    can stop early or only refresh enrichment data.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.data: Dict = {}
+        if self.path.exists():
+            try:
+                self.data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable build manifest %s: %s", self.path, exc)
+
+    def unchanged(self, readme_blobs: Dict[str, str], fingerprint: str, output: Path) -> bool:
+        return bool(self.data) and (
+            self.data.get("readme_blobs") == readme_blobs
+            and self.data.get("fingerprint") == fingerprint
+            and self.data.get("output_digest") == file_digest(output)
+        )
+
+    def save(self, readme_blobs: Dict[str, str], fingerprint: str, output: Path) -> None:
+        self.data = {
+            "readme_blobs": readme_blobs,
+            "fingerprint": fingerprint,
+            "output_digest": file_digest(output),
+            "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
@@ -0,0 +1,96 @@
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Substring containment is only meaningful for reasonably long titles; short
+# titles (e.g. "GNN") would otherwise match almost anything.
+CONTAINMENT_MIN_LENGTH = 20
+CONTAINMENT_SCORE = 0.95
+
+
+def normalize_title(text: str) -> str:
+    cleaned = _NON_ALNUM_RE.sub(" ", text.lower()).strip()
+    return " ".join(cleaned.split())
+
+
+class TitleMatcher:
+    """Title similarity with cached normalization and a cheap n-gram screen.
+
+    Scores are identical to ``difflib.SequenceMatcher.ratio`` on normalized
+    titles (plus the exact-match and containment shortcuts), so the
+    ``TITLE_*_THRESHOLD`` decisions in ``citations`` are unchanged. The speedup
+    comes from the character-count overlap ``2 * |A ∩ B| / (|A| + |B|)``,
+    which is a proven upper bound of ``ratio``: when scoring one title against
+    many candidates with a ``floor``, candidates whose bound is already below
+    the floor skip the quadratic matcher entirely and report the bound, which
+    keeps them ranked below every candidate whose exact score clears it.
+    The bound is computed for all candidates at once as a NumPy histogram;
+    normalized titles are plain ASCII, so one row of 128 counts per title.
+    """
+
+    def __init__(self, cache_size: int = 8192) -> None:
+        self._normalize = lru_cache(maxsize=cache_size)(normalize_title)
+
+    def normalize(self, text: str) -> str:
+        return self._normalize(text)
+
+    def _shortcut(self, a_norm: str, b_norm: str) -> Optional[float]:
+        if not a_norm or not b_norm:
+            return 0.0
+        if a_norm == b_norm:
+            return 1.0
+        if min(len(a_norm), len(b_norm)) >= CONTAINMENT_MIN_LENGTH and (
+            a_norm in b_norm or b_norm in a_norm
+        ):
+            return CONTAINMENT_SCORE
+        return None
+
+    @staticmethod
+    def upper_bounds(q_norm: str, c_norms: Sequence[str]) -> np.ndarray:
+        """Character-overlap bound on ``SequenceMatcher.ratio`` (its quick_ratio)
+        of ``q_norm`` against every normalized candidate."""
+        lengths = np.fromiter(map(len, c_norms), dtype=np.int64, count=len(c_norms))
+        chars = np.frombuffer("".join(c_norms).encode("ascii"), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(c_norms)), lengths)
+        counts = np.bincount(rows * 128 + chars, minlength=len(c_norms) * 128)
+        query = np.bincount(np.frombuffer(q_norm.encode("ascii"), dtype=np.uint8), minlength=128)
+        overlap = np.minimum(counts.reshape(len(c_norms), 128), query).sum(axis=1)
+        return 2.0 * overlap / np.maximum(lengths + len(q_norm), 1)
+
+    def similarity(self, a: str, b: str) -> float:
+        a_norm = self._normalize(a)
+        b_norm = self._normalize(b)
+        shortcut = self._shortcut(a_norm, b_norm)
+        if shortcut is not None:
+            return shortcut
+        return SequenceMatcher(None, a_norm, b_norm).ratio()
+
+    def bulk_similarity(
+        self, query: str, candidates: Sequence[str], floor: float = 0.0
+    ) -> List[float]:
+        """Score ``query`` against every candidate.
+
+        Scores at or above ``floor`` are exact; candidates that provably
+        cannot reach it get their (still sub-floor) upper bound instead.
+        """
+        q_norm = self._normalize(query)
+        c_norms = [self._normalize(candidate) for candidate in candidates]
+        scores: List[float] = []
+        for c_norm, bound in zip(c_norms, self.upper_bounds(q_norm, c_norms).tolist()):
+            shortcut = self._shortcut(q_norm, c_norm)
+            if shortcut is not None:
+                scores.append(shortcut)
+                continue
+            if bound < floor:
+                scores.append(bound)
+                continue
+            scores.append(SequenceMatcher(None, q_norm, c_norm).ratio())
+        return scores
+
+
+default_matcher = TitleMatcher()
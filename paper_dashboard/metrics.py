@@ -0,0 +1,108 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+
+# Upper bucket edges in milliseconds; the last bucket is open-ended.
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper edge of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for edge, n in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return float(edge)
+        return self.max_ms
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets_ms": list(LATENCY_BUCKETS_MS),
+            "bucket_counts": list(self.counts),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters and latency histograms, grouped as name -> label."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+
+    def incr(self, name: str, label: str, value: int = 1) -> None:
+        with self._lock:
+            group = self._counters.setdefault(name, {})
+            group[label] = group.get(label, 0) + value
+
+    def observe(self, name: str, label: str, seconds: float) -> None:
+        with self._lock:
+            group = self._histograms.setdefault(name, {})
+            group.setdefault(label, Histogram()).observe(seconds * 1000.0)
+
+    @contextmanager
+    def timer(self, name: str, label: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, label, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": {
+                    name: dict(sorted(group.items()))
+                    for name, group in sorted(self._counters.items())
+                },
+                "latency": {
+                    name: {label: hist.to_dict() for label, hist in sorted(group.items())}
+                    for name, group in sorted(self._histograms.items())
+                },
+            }
+
+    def summary_lines(self) -> List[str]:
+        snapshot = self.snapshot()
+        lines: List[str] = []
+        for name, group in snapshot["counters"].items():
+            parts = ", ".join(f"{label}={count}" for label, count in group.items())
+            lines.append(f"{name}: {parts}")
+        for name, group in snapshot["latency"].items():
+            for label, hist in group.items():
+                lines.append(
+                    f"{name}[{label}]: n={hist['count']} mean={hist['mean_ms']}ms "
+                    f"p50<={hist['p50_ms']}ms p95<={hist['p95_ms']}ms max={hist['max_ms']}ms"
+                )
+        return lines
+
+
+registry = MetricsRegistry()
@@ -1,13 +1,21 @@
+import hashlib
+import json
 import logging
 import re
 import subprocess
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .matching import normalize_title
 
 
 logger = logging.getLogger(__name__)
 
+# Bump when the section parser's output changes for the same input, so
+# ``IncrementalParser`` stores written by an older parser are discarded.
+PARSE_CACHE_VERSION = 1
+
 
 @dataclass
 class PaperEntry:
@@ -18,6 +26,13 @@ class PaperEntry:
     code_url: Optional[str]
     category: str
     subcategory: Optional[str] = None
+    # Source lists the paper was found in (several when lists are merged).
+    sources: List[str] = field(default_factory=list)
+    # Derived features, filled in once by ``analysis.enrich_papers``.
+    domain: Optional[str] = None
+    methods: List[str] = field(default_factory=list)
+    venue_stratum: Optional[str] = None
+    datasets: List[str] = field(default_factory=list)
 
     @property
     def has_code(self) -> bool:
@@ -37,122 +52,350 @@ class ParseResult:
     resources: List[ResourceLink]
 
 
-def sync_repo(repo_url: str, dest: Path) -> None:
-    """Clone or pull the source repo."""
+def sync_repo(repo_url: str, dest: Path, shallow: bool = True) -> None:
+    """Clone or update the source repo.
+
+    Shallow syncs fetch only the latest commit, as a blobless partial clone
+    with a sparse checkout of the top-level files, so README.md is the only
+    sizeable download. Updates fetch that one commit and move the checkout
+    to it; the directory is a build cache, not a working copy.
+    """
+    if not shallow:
+        if dest.exists():
+            logger.info("Updating existing repo at %s", dest)
+            subprocess.run(["git", "-C", str(dest), "pull", "--ff-only"], check=True)
+        else:
+            logger.info("Cloning %s into %s", repo_url, dest)
+            subprocess.run(["git", "clone", repo_url, str(dest)], check=True)
+        return
     if dest.exists():
-        logger.info("Updating existing repo at %s", dest)
-        subprocess.run(["git", "-C", str(dest), "pull", "--ff-only"], check=True)
+        logger.info("Fetching latest README into %s", dest)
+        subprocess.run(
+            ["git", "-C", str(dest), "fetch", "--depth", "1", "--filter=blob:none", "origin", "HEAD"],
+            check=True,
+        )
+        subprocess.run(["git", "-C", str(dest), "reset", "--hard", "--quiet", "FETCH_HEAD"], check=True)
     else:
-        logger.info("Cloning %s into %s", repo_url, dest)
-        subprocess.run(["git", "clone", repo_url, str(dest)], check=True)
+        logger.info("Shallow cloning %s into %s", repo_url, dest)
+        subprocess.run(
+            ["git", "clone", "--depth", "1", "--filter=blob:none", "--sparse", repo_url, str(dest)],
+            check=True,
+        )
+
+
+def readme_blob_hash(repo_dir: Path) -> str:
+    """Git blob id of README.md (what ``git rev-parse HEAD:README.md`` reports)."""
+    data = (repo_dir / "README.md").read_bytes()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+_LINK_RE = re.compile(r"\((https?://[^)]+)\)")
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+_RESOURCE_LINK_RE = re.compile(r"\[([^\]]+)\]\((https?://[^)]+)\)")
+_CATEGORY_BACK_RE = re.compile(r"\s*\[\[Back.*")
+_SUBCATEGORY_BACK_RE = re.compile(r"\[\[Back.*")
 
 
 def extract_link(cell: str) -> Optional[str]:
     """Extract first URL from a markdown link cell."""
-    match = re.search(r"\((https?://[^)]+)\)", cell)
+    match = _LINK_RE.search(cell)
     if match:
         return match.group(1).strip()
     return None
 
 
 def clean_title(raw: str) -> str:
-    title = re.sub(r"\*\*(.*?)\*\*", r"\1", raw)
+    title = _BOLD_RE.sub(r"\1", raw)
     title = title.replace("[", "").replace("]", "")
     return " ".join(title.split())
 
 
-def _parse_table_lines(
-    lines: List[str], category: str, subcategory: Optional[str]
-) -> List[PaperEntry]:
-    if len(lines) < 2:
-        return []
-    rows = lines[2:]  # skip header and separator
-    entries: List[PaperEntry] = []
-    for row in rows:
-        if not row.strip().startswith("|"):
-            continue
-        cells = [c.strip() for c in row.strip("|").split("|")]
-        if len(cells) < 5:
-            continue
-        year_raw, title_raw, venue_raw, paper_cell, code_cell = cells[:5]
-        try:
-            year = int(year_raw)
-        except ValueError:
-            year = None
-        title = clean_title(title_raw)
-        venue = venue_raw.strip()
-        paper_url = extract_link(paper_cell)
-        code_url = extract_link(code_cell)
-        entries.append(
-            PaperEntry(
-                year=year,
-                title=title,
-                venue=venue,
-                paper_url=paper_url,
-                code_url=code_url,
-                category=category,
-                subcategory=subcategory,
-            )
-        )
-    return entries
+def _parse_row(row: str, category: str, subcategory: Optional[str]) -> Optional[PaperEntry]:
+    cells = [c.strip() for c in row.strip("|").split("|")]
+    if len(cells) < 5:
+        return None
+    year_raw, title_raw, venue_raw, paper_cell, code_cell = cells[:5]
+    try:
+        year = int(year_raw)
+    except ValueError:
+        year = None
+    return PaperEntry(
+        year=year,
+        title=clean_title(title_raw),
+        venue=venue_raw.strip(),
+        paper_url=extract_link(paper_cell),
+        code_url=extract_link(code_cell),
+        category=category,
+        subcategory=subcategory,
+    )
 
 
 RESOURCE_ONLY_SECTIONS = {"Toolbox", "Dataset", "Survey Paper", "Other Resource"}
 
 
-def parse_readme(text: str) -> ParseResult:
-    """Parse the README markdown tables into structured entries."""
-    papers: List[PaperEntry] = []
-    resources: List[ResourceLink] = []
-
-    current_category: Optional[str] = None
-    current_subcategory: Optional[str] = None
-    table_buffer: List[str] = []
-    lines = text.splitlines()
+def iter_entries(
+    lines: Iterable[str], category: Optional[str] = None, subcategory: Optional[str] = None
+) -> Iterator[Union[PaperEntry, ResourceLink]]:
+    """Yield papers and resource links as each README line completes one.
 
-    def flush_table():
-        nonlocal table_buffer, papers, current_category, current_subcategory
-        if table_buffer and current_category:
-            papers.extend(_parse_table_lines(table_buffer, current_category, current_subcategory))
-        table_buffer = []
+    Accepts any line iterator (an open file works), keeps only the current
+    heading context and the position within the current table, and never
+    buffers rows, so memory stays flat however long the list is.
+    """
+    current_category = category
+    current_subcategory = subcategory
+    # Lines seen in the current table; the first two are header and separator.
+    table_row = 0
 
-    for raw_line in lines + [""]:
+    for raw_line in lines:
         line = raw_line.strip()
         if line.startswith("## "):
-            flush_table()
-            current_category = line.lstrip("#").strip()
-            current_category = re.sub(r"\s*\[\[Back.*", "", current_category).strip()
+            current_category = _category_heading(line)
             current_subcategory = None
+            table_row = 0
             continue
 
         if line.startswith("### "):
-            flush_table()
-            sub = line.lstrip("#").strip()
-            sub = re.sub(r"\[\[Back.*", "", sub).strip()
-            current_subcategory = sub
+            current_subcategory = _subcategory_heading(line)
+            table_row = 0
             continue
 
         if line.startswith("|"):
-            table_buffer.append(line)
+            table_row += 1
+            if table_row > 2 and current_category:
+                entry = _parse_row(line, current_category, current_subcategory)
+                if entry is not None:
+                    yield entry
             continue
+        table_row = 0
 
         # Standalone links for resource-only sections
         if current_category in RESOURCE_ONLY_SECTIONS:
-            link_match = re.match(r"\[([^\]]+)\]\((https?://[^)]+)\)", line)
+            link_match = _RESOURCE_LINK_RE.match(line)
             if link_match:
-                resources.append(
-                    ResourceLink(
-                        title=link_match.group(1).strip(),
-                        url=link_match.group(2).strip(),
-                        category=current_category,
-                    )
+                yield ResourceLink(
+                    title=link_match.group(1).strip(),
+                    url=link_match.group(2).strip(),
+                    category=current_category,
                 )
-        if table_buffer:
-            flush_table()
 
+
+def _collect(entries: Iterable[Union[PaperEntry, ResourceLink]]) -> ParseResult:
+    papers: List[PaperEntry] = []
+    resources: List[ResourceLink] = []
+    for entry in entries:
+        if isinstance(entry, PaperEntry):
+            papers.append(entry)
+        else:
+            resources.append(entry)
     return ParseResult(papers=papers, resources=resources)
 
 
+def _category_heading(line: str) -> str:
+    category = line.lstrip("#").strip()
+    return _CATEGORY_BACK_RE.sub("", category).strip()
+
+
+def _subcategory_heading(line: str) -> str:
+    sub = line.lstrip("#").strip()
+    return _SUBCATEGORY_BACK_RE.sub("", sub).strip()
+
+
+def parse_readme(text: str) -> ParseResult:
+    """Parse the README markdown tables into structured entries."""
+    return _collect(iter_entries(text.splitlines()))
+
+
+@dataclass
+class ReadmeSection:
+    """A ``##``/``###`` heading and the lines up to the next heading.
+
+    ``category`` is the enclosing ``##`` category a ``###`` section inherits;
+    together with the lines it fully determines what the section parses to.
+    """
+
+    category: Optional[str]
+    lines: List[str]
+
+    @property
+    def digest(self) -> str:
+        text = "\n".join([self.category or ""] + self.lines)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def parse(self) -> ParseResult:
+        return _collect(iter_entries(self.lines, self.category))
+
+
+def split_sections(text: str) -> List[ReadmeSection]:
+    sections: List[ReadmeSection] = []
+    category: Optional[str] = None
+    current = ReadmeSection(category=None, lines=[])
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("## ") or line.startswith("### "):
+            sections.append(current)
+            if line.startswith("## "):
+                category = None
+            current = ReadmeSection(category=category, lines=[])
+            if line.startswith("## "):
+                category = _category_heading(line)
+        current.lines.append(raw_line)
+    sections.append(current)
+    return sections
+
+
+@dataclass
+class ParseDiff:
+    """Paper-level changes between two parses, keyed by normalized title."""
+
+    added: List[PaperEntry] = field(default_factory=list)
+    removed: List[PaperEntry] = field(default_factory=list)
+    changed: List[Tuple[PaperEntry, PaperEntry]] = field(default_factory=list)
+    reparsed_sections: int = 0
+    reused_sections: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    @classmethod
+    def between(cls, old: Iterable[PaperEntry], new: Iterable[PaperEntry]) -> "ParseDiff":
+        diff = cls()
+        old_by_key: Dict[Tuple[str, int], PaperEntry] = {}
+        seen: Dict[str, int] = {}
+        for paper in old:
+            key = normalize_title(paper.title)
+            old_by_key[(key, seen.get(key, 0))] = paper
+            seen[key] = seen.get(key, 0) + 1
+        seen = {}
+        for paper in new:
+            key = normalize_title(paper.title)
+            previous = old_by_key.pop((key, seen.get(key, 0)), None)
+            seen[key] = seen.get(key, 0) + 1
+            if previous is None:
+                diff.added.append(paper)
+            elif previous != paper:
+                diff.changed.append((previous, paper))
+        diff.removed.extend(old_by_key.values())
+        return diff
+
+
+class IncrementalParser:
+    """Parses a README while reusing entries of sections seen last time.
+
+    Sections are keyed by ``ReadmeSection.digest``; unchanged ones reuse
+    their stored papers and resources, and only edited or new sections are
+    parsed again. ``parse`` also returns a ``ParseDiff`` against the previous
+    run, built from the changed sections alone. The store at ``path`` is only
+    rewritten by ``save``, so a failed build leaves the baseline untouched.
+    A store written under another ``cache_version`` is discarded, and a
+    section whose stored entries no longer load is parsed again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._order: List[str] = []
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                stored = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable parse cache %s: %s", self.path, exc)
+            else:
+                if stored.get("version") == self.cache_version():
+                    self._order = stored.get("order") or []
+                    self._entries = stored.get("sections") or {}
+                else:
+                    logger.info("Discarding parse cache %s written by another parser version", self.path)
+        self._pending: Optional[Dict] = None
+
+    @staticmethod
+    def cache_version() -> str:
+        """``PARSE_CACHE_VERSION`` plus the stored dataclass fields.
+
+        Adding or renaming a ``PaperEntry``/``ResourceLink`` field changes
+        it too, so stored sections always match the current schema.
+        """
+        schema = ",".join(f.name for cls in (PaperEntry, ResourceLink) for f in fields(cls))
+        digest = hashlib.sha256(schema.encode("utf-8")).hexdigest()[:12]
+        return f"{PARSE_CACHE_VERSION}-{digest}"
+
+    @staticmethod
+    def _load(stored: Dict) -> Optional[ParseResult]:
+        """Entries of a stored section, or None if they no longer load."""
+        try:
+            return ParseResult(
+                papers=[PaperEntry(**raw) for raw in stored["papers"]],
+                resources=[ResourceLink(**raw) for raw in stored["resources"]],
+            )
+        except (KeyError, TypeError) as exc:
+            logger.warning("Reparsing a malformed parse cache section: %s", exc)
+            return None
+
+    def parse(self, text: str) -> Tuple[ParseResult, ParseDiff]:
+        sections = split_sections(text)
+        digests = [section.digest for section in sections]
+        previous = set(self._order)
+        results: Dict[str, ParseResult] = {}
+        stored: Dict[str, Dict] = {}
+        for digest, section in zip(digests, sections):
+            if digest in results:
+                continue
+            reused = self._load(self._entries[digest]) if digest in self._entries else None
+            if reused is not None:
+                stored[digest] = self._entries[digest]
+                results[digest] = reused
+            else:
+                self._entries.pop(digest, None)
+                results[digest] = section.parse()
+                stored[digest] = {
+                    "papers": [asdict(p) for p in results[digest].papers],
+                    "resources": [asdict(r) for r in results[digest].resources],
+                }
+        reparsed = sum(1 for digest in digests if digest not in self._entries)
+
+        papers: List[PaperEntry] = []
+        resources: List[ResourceLink] = []
+        for digest in digests:
+            papers.extend(results[digest].papers)
+            resources.extend(results[digest].resources)
+
+        current = set(digests)
+        old_papers = [
+            paper
+            for digest in self._order
+            if digest not in current and digest in self._entries
+            for paper in (self._load(self._entries[digest]) or ParseResult([], [])).papers
+        ]
+        new_papers = [
+            paper for digest in digests if digest not in previous for paper in results[digest].papers
+        ]
+        diff = ParseDiff.between(old_papers, new_papers)
+        diff.reparsed_sections = reparsed
+        diff.reused_sections = len(digests) - reparsed
+
+        self._pending = {"version": self.cache_version(), "order": digests, "sections": stored}
+        return ParseResult(papers=papers, resources=resources), diff
+
+    def save(self) -> None:
+        """Make the last ``parse`` the baseline for the next one."""
+        if self._pending is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._pending, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.path)
+        self._order = self._pending["order"]
+        self._entries = self._pending["sections"]
+        self._pending = None
+
+
 def load_readme(repo_dir: Path) -> str:
     readme_path = repo_dir / "README.md"
     return readme_path.read_text(encoding="utf-8")
+
+
+def stream_readme(repo_dir: Path) -> Iterator[Union[PaperEntry, ResourceLink]]:
+    """Lazily parse ``README.md`` without reading it into memory."""
+    with (repo_dir / "README.md").open(encoding="utf-8") as handle:
+        yield from iter_entries(handle)
@@ -0,0 +1,184 @@
+import json
+import logging
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .code_repos import RepoMetadata
+
+
+logger = logging.getLogger(__name__)
+
+# Fields stored verbatim in a delta; ``languages`` is diffed per language.
+_SCALAR_FIELDS = ("url", "stars", "language", "topics")
+
+
+def _language_contribution(state: Dict) -> Dict[str, int]:
+    """What one repo adds to ``aggregate_languages`` (bytes, or 1 per repo)."""
+    if state.get("languages"):
+        return state["languages"]
+    if state.get("language"):
+        return {state["language"]: 1}
+    return {}
+
+
+class RepoHistory:
+    """Append-only, delta-encoded log of ``RepoMetadata`` snapshots.
+
+    Every build appends a ``{"build": <timestamp>}`` marker followed by one
+    line per repo whose metadata changed since its previous snapshot, holding
+    only the changed fields (``languages`` as a per-language delta where
+    ``null`` drops a language). Repos that left the list get a ``removed``
+    line and renames an ``alias`` line. An unchanged repo costs nothing, and
+    replaying the log recovers star and language trends without asking
+    GitHub for history.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._states: Dict[str, Dict] = {}
+        self._aliases: Dict[str, str] = {}
+        self._previous_names: Dict[str, List[str]] = {}
+        self._stars: Dict[str, List[Tuple[str, int]]] = {}
+        self._language_points: List[Tuple[str, Dict[str, int]]] = []
+        self._totals: Dict[str, int] = {}
+        self._build: Optional[str] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write; skip it.
+                    continue
+                self._apply(record)
+        self._close_build()
+        self._build = None
+
+    def _close_build(self) -> None:
+        if self._build is not None:
+            totals = {lang: size for lang, size in self._totals.items() if size}
+            self._language_points.append((self._build, totals))
+
+    def _adjust_totals(self, state: Dict, sign: int) -> None:
+        for lang, size in _language_contribution(state).items():
+            self._totals[lang] = self._totals.get(lang, 0) + sign * size
+
+    def _apply(self, record: Dict) -> None:
+        if "build" in record:
+            self._close_build()
+            self._build = record["build"]
+            return
+        if "alias" in record:
+            self._aliases[record["alias"].lower()] = record["repo"]
+            self._previous_names.setdefault(record["repo"], []).append(record["alias"])
+            return
+        name = record.get("repo")
+        if not name:
+            return
+        old = self._states.get(name)
+        if old is not None:
+            self._adjust_totals(old, -1)
+        if record.get("removed"):
+            self._states.pop(name, None)
+            return
+        state = dict(old or {"languages": {}})
+        for field in _SCALAR_FIELDS:
+            if field in record:
+                state[field] = record[field]
+        if "languages" in record:
+            languages = dict(state.get("languages") or {})
+            for lang, size in record["languages"].items():
+                if size is None:
+                    languages.pop(lang, None)
+                else:
+                    languages[lang] = size
+            state["languages"] = languages
+        self._states[name] = state
+        self._adjust_totals(state, 1)
+        if "stars" in record and self._build is not None:
+            self._stars.setdefault(name, []).append((self._build, record["stars"]))
+
+    @staticmethod
+    def _delta(old: Optional[Dict], new: Dict) -> Dict:
+        if old is None:
+            return {field: new[field] for field in _SCALAR_FIELDS + ("languages",)}
+        delta = {
+            field: new[field] for field in _SCALAR_FIELDS if old.get(field) != new[field]
+        }
+        old_langs = old.get("languages") or {}
+        languages = {
+            lang: size for lang, size in new["languages"].items() if old_langs.get(lang) != size
+        }
+        languages.update({lang: None for lang in old_langs if lang not in new["languages"]})
+        if languages:
+            delta["languages"] = languages
+        return delta
+
+    @property
+    def aliases(self) -> Dict[str, str]:
+        """Lower-cased old names mapped to the canonical ``full_name``."""
+        return self._aliases
+
+    def latest(self) -> Dict[str, RepoMetadata]:
+        return {
+            name: RepoMetadata(full_name=name, **state)
+            for name, state in self._states.items()
+        }
+
+    def record(
+        self,
+        repos: Iterable[RepoMetadata],
+        renames: Optional[Mapping[str, str]] = None,
+        at: Optional[str] = None,
+    ) -> None:
+        """Append one build: changed repos, removals and newly seen renames."""
+        at = at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        lines: List[Dict] = [{"build": at}]
+        for old, new in sorted((renames or {}).items()):
+            if self._aliases.get(old.lower()) != new:
+                lines.append({"alias": old, "repo": new})
+        current = {repo.full_name: asdict(repo) for repo in repos}
+        for name, snapshot in current.items():
+            snapshot.pop("full_name")
+            delta = self._delta(self._states.get(name), snapshot)
+            if delta:
+                lines.append(dict(repo=name, **delta))
+        lines.extend(
+            {"repo": name, "removed": True} for name in self._states if name not in current
+        )
+        for line in lines:
+            self._apply(line)
+        self._close_build()
+        self._build = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            for line in lines:
+                handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+        logger.info("Recorded %d repo changes to %s", len(lines) - 1, self.path)
+
+    def star_trend(self, name: str) -> List[Dict]:
+        """Star counts at every build where they changed, oldest first.
+
+        Points recorded under a repo's previous names are included.
+        """
+        points = list(self._stars.get(name, []))
+        for old in self._previous_names.get(name, []):
+            points.extend(self._stars.get(old, []))
+        return [{"at": at, "stars": stars} for at, stars in sorted(points)]
+
+    def language_trend(self, top_k: int = 8) -> List[Dict]:
+        """Per-build language totals for the ``top_k`` currently largest languages."""
+        if not self._language_points:
+            return []
+        latest = self._language_points[-1][1]
+        languages = sorted(latest, key=latest.get, reverse=True)[:top_k]
+        return [
+            {"at": at, "languages": {lang: totals.get(lang, 0) for lang in languages}}
+            for at, totals in self._language_points
+        ]
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+from .matching import normalize_title
+from .parser import PaperEntry
+
+
+logger = logging.getLogger(__name__)
+
+# Terms are sharded on their first characters; a prefix query of at least
+# this length touches exactly one shard.
+SHARD_PREFIX = 2
+INDEX_VERSION = 1
+
+
+def search_tokens(text: str) -> List[str]:
+    """Index terms of ``text``, normalized exactly like ``normalize_title``."""
+    return normalize_title(text or "").split()
+
+
+def delta_encode(ids: Sequence[int]) -> List[int]:
+    """Ascending ids -> first id followed by the gaps between neighbours."""
+    previous = 0
+    gaps = []
+    for doc_id in ids:
+        gaps.append(doc_id - previous)
+        previous = doc_id
+    return gaps
+
+
+def papers_digest(papers: Sequence[Dict]) -> str:
+    """Digest of the serialized ``papers`` list of data.json.
+
+    Written into both data.json and ``index.json`` so the browser can tell
+    an index built for a different paper list, even one of the same length.
+    """
+    raw = json.dumps(papers, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class SearchIndex:
+    """Inverted index over paper titles, venues and categories.
+
+    Document ids are positions in the ``papers`` list of data.json. Postings
+    are ascending ids stored as gaps, and terms are split into shards by
+    their first ``SHARD_PREFIX`` characters so the browser only fetches the
+    shard a query prefix falls in; within a shard terms are sorted, which
+    turns a prefix lookup into a binary search over a contiguous range.
+    Queries therefore only match the start of a term: "graph" finds
+    "graphs" but not "subgraph"; the explorer scans when that finds nothing.
+    """
+
+    fields = ("title", "venue", "category")
+
+    def __init__(self) -> None:
+        self.size = 0
+        self._postings: Dict[str, List[int]] = {}
+
+    @classmethod
+    def from_papers(cls, papers: Iterable[PaperEntry]) -> "SearchIndex":
+        index = cls()
+        for paper in papers:
+            index.add(paper.title, paper.venue, paper.category)
+        return index
+
+    def add(self, *texts: str) -> int:
+        """Index one document and return its id."""
+        doc_id = self.size
+        self.size += 1
+        for text in texts:
+            for token in search_tokens(text):
+                postings = self._postings.setdefault(token, [])
+                # Ids only grow, so a repeat is always the last entry.
+                if not postings or postings[-1] != doc_id:
+                    postings.append(doc_id)
+        return doc_id
+
+    def shards(self) -> Dict[str, Dict[str, list]]:
+        shards: Dict[str, Dict[str, list]] = {}
+        for term in sorted(self._postings):
+            shard = shards.setdefault(term[:SHARD_PREFIX], {"terms": [], "postings": []})
+            shard["terms"].append(term)
+            shard["postings"].append(delta_encode(self._postings[term]))
+        return shards
+
+    def write(self, directory: Path, papers_hash: str) -> Dict:
+        """Write ``index.json`` and one file per shard into ``directory``.
+
+        ``papers_hash`` is the ``papers_digest`` of the data.json the ids
+        refer to. Shard files left over from an earlier build are removed
+        first.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob("*.json"):
+            stale.unlink()
+        shards = self.shards()
+        manifest = {
+            "version": INDEX_VERSION,
+            "papers": self.size,
+            "papers_hash": papers_hash,
+            "fields": list(self.fields),
+            "shard_prefix": SHARD_PREFIX,
+            "shards": {key: len(shard["terms"]) for key, shard in shards.items()},
+        }
+        for key, shard in shards.items():
+            (directory / f"{key}.json").write_text(
+                json.dumps(shard, separators=(",", ":")), encoding="utf-8"
+            )
+        (directory / "index.json").write_text(
+            json.dumps(manifest, separators=(",", ":")), encoding="utf-8"
+        )
+        logger.info(
+            "Wrote search index for %d papers: %d terms in %d shards",
+            self.size,
+            len(self._postings),
+            len(shards),
+        )
+        return manifest
@@ -0,0 +1,184 @@
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .citations import paper_keys
+from .parser import (
+    IncrementalParser,
+    PaperEntry,
+    ParseDiff,
+    ParseResult,
+    ResourceLink,
+    load_readme,
+    parse_readme,
+    readme_blob_hash,
+    sync_repo,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PaperSource:
+    """One curated list: where it comes from and where it is checked out."""
+
+    url: str
+    repo_dir: Path
+    parse_cache: Optional[Path] = None
+
+
+@dataclass
+class SourceResult:
+    source: PaperSource
+    parsed: ParseResult
+    diff: Optional[ParseDiff] = None
+    # Carries the pending section store back from the worker for ``save``.
+    parser: Optional[IncrementalParser] = None
+
+
+def source_slug(url: str) -> str:
+    """``https://github.com/owner/repo(.git)`` -> ``owner__repo``."""
+    parts = [p for p in re.split(r"[/:]", url.rstrip("/")) if p]
+    tail = parts[-2:] if len(parts) >= 2 else parts
+    slug = "__".join(tail)
+    if slug.endswith(".git"):
+        slug = slug[:-4]
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", slug) or "source"
+
+
+def plan_sources(
+    urls: Sequence[str], repo_dir: Path, parse_cache: Optional[Path]
+) -> List[PaperSource]:
+    """Checkout and parse-cache locations for each source URL.
+
+    A single source keeps the given paths unchanged; several sources get one
+    subdirectory (and one parse cache) per repository.
+    """
+    if len(urls) == 1:
+        return [PaperSource(urls[0], repo_dir, parse_cache)]
+    sources = []
+    for url in urls:
+        slug = source_slug(url)
+        cache = (
+            parse_cache.with_name(f"{parse_cache.stem}.{slug}{parse_cache.suffix}")
+            if parse_cache
+            else None
+        )
+        sources.append(PaperSource(url, repo_dir / slug, cache))
+    return sources
+
+
+def sync_source(source: PaperSource, sync: bool = True, shallow: bool = True) -> str:
+    """Bring one checkout up to date and return its README blob id."""
+    if sync:
+        sync_repo(source.url, source.repo_dir, shallow=shallow)
+    return readme_blob_hash(source.repo_dir)
+
+
+def sync_sources(
+    sources: Sequence[PaperSource],
+    sync: bool = True,
+    shallow: bool = True,
+    max_workers: Optional[int] = None,
+) -> Dict[str, str]:
+    """Sync every source and map each URL to its README blob id.
+
+    Runs before any parsing, so a build can compare the blobs with its
+    manifest and stop without reading a README. git does the work in
+    subprocesses, so threads are enough to overlap several sources.
+    """
+    count = len(sources)
+    workers = max_workers or min(count, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        blobs = pool.map(sync_source, sources, [sync] * count, [shallow] * count)
+        return {source.url: blob for source, blob in zip(sources, blobs)}
+
+
+def ingest_source(source: PaperSource) -> SourceResult:
+    """Read and parse one synced source; runs in a worker process."""
+    text = load_readme(source.repo_dir)
+    if source.parse_cache is None:
+        return SourceResult(source, parse_readme(text))
+    parser = IncrementalParser(source.parse_cache)
+    parsed, diff = parser.parse(text)
+    return SourceResult(source, parsed, diff, parser)
+
+
+def ingest_sources(
+    sources: Sequence[PaperSource], max_workers: Optional[int] = None
+) -> List[SourceResult]:
+    """Parse every source, in parallel processes when there are several."""
+    if len(sources) == 1:
+        return [ingest_source(sources[0])]
+    workers = max_workers or min(len(sources), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(ingest_source, sources))
+
+
+class PaperIndex:
+    """Merges papers from several lists, keeping one entry per work.
+
+    A paper matching an entry from an earlier source on any key (DOI, arXiv
+    id or normalized title) is folded into it: its source is appended to
+    ``sources`` and missing year, paper or code links are filled in. Repeats
+    within one source are kept, as they are in a single-list build, since
+    the same paper is often listed under several categories. Resources
+    are deduplicated by URL the same way: only against earlier sources.
+    """
+
+    def __init__(self) -> None:
+        self.papers: List[PaperEntry] = []
+        self.resources: List[ResourceLink] = []
+        self._by_key: Dict[str, PaperEntry] = {}
+        self._resource_urls: Dict[str, ResourceLink] = {}
+        self.merged = 0
+
+    def add_source(self, url: str, parsed: ParseResult) -> None:
+        added: List[Tuple[PaperEntry, List[str]]] = []
+        for paper in parsed.papers:
+            keys = paper_keys(paper)
+            existing = next((self._by_key[k] for k in keys if k in self._by_key), None)
+            if existing is None:
+                paper.sources = [url]
+                self.papers.append(paper)
+                added.append((paper, keys))
+                continue
+            self.merged += 1
+            if url not in existing.sources:
+                existing.sources.append(url)
+            existing.year = existing.year or paper.year
+            existing.paper_url = existing.paper_url or paper.paper_url
+            existing.code_url = existing.code_url or paper.code_url
+        # Only resources already listed by an earlier source are dropped; one
+        # list may link the same URL under several entries.
+        for resource in parsed.resources:
+            if resource.url not in self._resource_urls:
+                self.resources.append(resource)
+        # Register after the whole source so its own repeats stay separate.
+        for paper, keys in added:
+            for key in keys:
+                self._by_key.setdefault(key, paper)
+        for resource in parsed.resources:
+            self._resource_urls.setdefault(resource.url, resource)
+
+    def result(self) -> ParseResult:
+        return ParseResult(papers=self.papers, resources=self.resources)
+
+
+def merge_sources(results: Sequence[SourceResult]) -> ParseResult:
+    index = PaperIndex()
+    for result in results:
+        index.add_source(result.source.url, result.parsed)
+    if len(results) > 1:
+        logger.info(
+            "Merged %d sources into %d papers (%d cross-list duplicates folded)",
+            len(results),
+            len(index.papers),
+            index.merged,
+        )
+    return index.result()
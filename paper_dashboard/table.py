@@ -0,0 +1,152 @@
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .parser import PaperEntry, ResourceLink
+
+
+class StringDictionary:
+    """Interned strings with dense integer codes, in first-seen order."""
+
+    def __init__(self) -> None:
+        self.values: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            if value is not None:
+                value = sys.intern(value)
+            self.values.append(value)
+            self._codes[value] = code
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class PaperTable:
+    """Column-oriented paper list for the analysis layer.
+
+    Years live in an int array (0 for unknown), venue, category and
+    subcategory are dictionary-encoded codes into interned strings, and code
+    availability is a bitmap. Titles and links stay plain lists. Aggregations
+    in ``analysis`` detect a table and count over the columns instead of
+    walking ``PaperEntry`` objects; iterating a table still yields entries,
+    so every other consumer keeps working unchanged.
+
+    A table is smaller than the entry list it is built from, but it only
+    saves memory when it replaces that list. ``build_stats`` builds one next
+    to the merged list, which citations, serialization and the search index
+    still need, so there it trades a little extra memory for speed.
+
+    Derived features from ``analysis.enrich_papers`` are kept too: domain and
+    venue stratum as codes, method and dataset tags as shared tuples.
+    ``enriched`` is true when every row carried them.
+    """
+
+    def __init__(self) -> None:
+        self.years = array("i")
+        self.venues = StringDictionary()
+        self.categories = StringDictionary()
+        self.subcategories = StringDictionary()
+        self.venue_codes = array("I")
+        self.category_codes = array("I")
+        self.subcategory_codes = array("I")
+        self.has_code = bytearray()
+        self.titles: List[str] = []
+        self.paper_urls: List[Optional[str]] = []
+        self.code_urls: List[Optional[str]] = []
+        self.sources: List[List[str]] = []
+        self.domains = StringDictionary()
+        self.strata = StringDictionary()
+        self.domain_codes = array("I")
+        self.stratum_codes = array("I")
+        self.methods: List[Tuple[str, ...]] = []
+        self.datasets: List[Tuple[str, ...]] = []
+        self._tag_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self._unenriched = 0
+
+    @classmethod
+    def from_entries(
+        cls, entries: Iterable[Union[PaperEntry, ResourceLink]]
+    ) -> "PaperTable":
+        """Build a table from papers, e.g. straight from ``parser.iter_entries``.
+
+        Resource links in the stream are skipped.
+        """
+        table = cls()
+        for entry in entries:
+            if isinstance(entry, PaperEntry):
+                table.append(entry)
+        return table
+
+    def append(self, paper: PaperEntry) -> None:
+        row = len(self.titles)
+        year = paper.year
+        self.years.append(year or 0)
+        self.venue_codes.append(self.venues.encode(paper.venue))
+        self.category_codes.append(self.categories.encode(paper.category))
+        self.subcategory_codes.append(self.subcategories.encode(paper.subcategory))
+        if row % 8 == 0:
+            self.has_code.append(0)
+        if paper.code_url:
+            self.has_code[row >> 3] |= 1 << (row & 7)
+        self.titles.append(paper.title)
+        self.paper_urls.append(paper.paper_url)
+        self.code_urls.append(paper.code_url)
+        self.sources.append(paper.sources)
+        if paper.domain is None:
+            self._unenriched += 1
+        self.domain_codes.append(self.domains.encode(paper.domain))
+        self.stratum_codes.append(self.strata.encode(paper.venue_stratum))
+        self.methods.append(self._tags(paper.methods))
+        self.datasets.append(self._tags(paper.datasets))
+
+    def _tags(self, tags: List[str]) -> Tuple[str, ...]:
+        key = tuple(tags)
+        return self._tag_sets.setdefault(key, key)
+
+    @property
+    def enriched(self) -> bool:
+        return self._unenriched == 0
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def row(self, index: int) -> PaperEntry:
+        return PaperEntry(
+            year=self.years[index] or None,
+            title=self.titles[index],
+            venue=self.venues.values[self.venue_codes[index]],
+            paper_url=self.paper_urls[index],
+            code_url=self.code_urls[index],
+            category=self.categories.values[self.category_codes[index]],
+            subcategory=self.subcategories.values[self.subcategory_codes[index]],
+            sources=self.sources[index],
+            domain=self.domains.values[self.domain_codes[index]],
+            methods=list(self.methods[index]),
+            venue_stratum=self.strata.values[self.stratum_codes[index]],
+            datasets=list(self.datasets[index]),
+        )
+
+    def __iter__(self) -> Iterator[PaperEntry]:
+        return (self.row(index) for index in range(len(self)))
+
+    def code_count(self) -> int:
+        return int.from_bytes(self.has_code, "little").bit_count()
+
+    def venue_histogram(self) -> Counter:
+        """Row count per venue code, keyed in first-seen order."""
+        return Counter(self.venue_codes)
+
+    def category_histogram(self) -> Counter:
+        return Counter(self.category_codes)
+
+    def year_histogram(self) -> Counter:
+        """Row count per known year."""
+        counts = Counter(self.years)
+        counts.pop(0, None)
+        return counts
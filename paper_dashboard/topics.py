@@ -0,0 +1,186 @@
+from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .analysis import STOPWORDS
+
+# Words that never start or end a bigram; "graph for" or "via contrastive"
+# are not topics. Other stopwords may still appear inside a bigram such as
+# "contrastive learning", but a bigram made only of stopwords is dropped.
+BIGRAM_STOPWORDS = {
+    "for",
+    "and",
+    "with",
+    "via",
+    "using",
+    "the",
+    "from",
+    "into",
+    "over",
+    "under",
+    "towards",
+    "toward",
+    "through",
+    "against",
+    "without",
+    "beyond",
+    "based",
+    "its",
+    "their",
+    "are",
+    "can",
+    "not",
+    "how",
+    "what",
+    "when",
+    "new",
+}
+
+
+class TopicModel:
+    """Sparse TF-IDF document-term matrix of title unigrams and bigrams.
+
+    Each title comes as its ``analysis.title_words``, so the tokens of the
+    shared accumulator pass are reused. Unigrams are the words that are not
+    ``STOPWORDS``. Bigrams are adjacent words of a title where neither is in
+    ``BIGRAM_STOPWORDS`` and not both are in ``STOPWORDS``, so "contrastive
+    learning" counts but "graph networks" and "learning for" do not. Words
+    are interned once; bigram building, term counting and weighting are
+    array operations on the matrix in coordinate form (``docs``,
+    ``term_ids``, ``weights``). Weights are smoothed TF-IDF,
+    L2-normalized per title, and a group's score for a term is the sum of
+    its titles' weights, so a term ranks high when it is both common in the
+    group and rare in the corpus. Terms found in fewer than ``min_df``
+    titles are ignored.
+    """
+
+    def __init__(self, documents: Sequence[Sequence[str]], min_df: int = 2) -> None:
+        self.size = len(documents)
+        lengths = np.fromiter(map(len, documents), dtype=np.int64, count=self.size)
+        flat = list(chain.from_iterable(documents))
+        words = list(dict.fromkeys(flat))
+        codes = {word: code for code, word in enumerate(words)}
+        tokens = np.fromiter(map(codes.__getitem__, flat), dtype=np.int64, count=len(flat))
+        docs = np.repeat(np.arange(self.size), lengths)
+
+        stop = np.fromiter((w in STOPWORDS for w in words), dtype=bool, count=len(words))
+        edge = np.fromiter((w in BIGRAM_STOPWORDS for w in words), dtype=bool, count=len(words))
+        first, second = tokens[:-1], tokens[1:]
+        pairs = (
+            (docs[:-1] == docs[1:])
+            & ~edge[first]
+            & ~edge[second]
+            & ~(stop[first] & stop[second])
+        )
+        width = max(len(words), 1)
+        bigrams, bigram_ids = np.unique(
+            first[pairs] * width + second[pairs], return_inverse=True
+        )
+        # Term ids: words keep their codes, bigrams follow after all words.
+        self._words = words
+        self._bigrams = bigrams
+        self._width = width
+        unigrams = ~stop[tokens]
+        doc_ids = np.concatenate([docs[unigrams], docs[:-1][pairs]])
+        term_ids = np.concatenate([tokens[unigrams], width + bigram_ids.reshape(-1)])
+
+        vocab = width + len(bigrams)
+        keys, tf = np.unique(doc_ids * vocab + term_ids, return_counts=True)
+        docs = keys // vocab
+        terms = keys % vocab
+        df = np.bincount(terms, minlength=vocab)
+        keep = df[terms] >= min_df
+        docs, terms, tf = docs[keep], terms[keep], tf[keep]
+        weights = tf * (np.log((1 + self.size) / (1 + df[terms])) + 1)
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=self.size))
+        # Renumber the surviving terms densely so per-group score tables stay
+        # as small as the useful vocabulary.
+        self._kept = np.flatnonzero(df >= min_df)
+        renumber = np.zeros(vocab, dtype=np.int64)
+        renumber[self._kept] = np.arange(len(self._kept))
+        self.vocab_size = len(self._kept)
+        self.docs = docs
+        self.term_ids = renumber[terms]
+        self.weights = weights / norms[docs] if len(docs) else weights
+
+    def term(self, term_id: int) -> str:
+        term_id = int(self._kept[term_id])
+        if term_id < self._width:
+            return self._words[term_id]
+        pair = int(self._bigrams[term_id - self._width])
+        return f"{self._words[pair // self._width]} {self._words[pair % self._width]}"
+
+    def top_terms(
+        self, groups: Optional[np.ndarray] = None, group_count: int = 1, top_k: int = 10
+    ) -> List[List[Dict]]:
+        """The ``top_k`` terms of every group, by summed TF-IDF weight.
+
+        ``groups`` gives each title's group in ``range(group_count)``, or -1
+        to leave it out; without it all titles form one group. ``count`` is
+        the number of titles in the group containing the term.
+        """
+        if groups is None:
+            doc_groups = np.zeros(len(self.docs), dtype=np.int64)
+        else:
+            doc_groups = np.asarray(groups, dtype=np.int64)[self.docs]
+        mask = doc_groups >= 0
+        width = self.vocab_size
+        keys = doc_groups[mask] * width + self.term_ids[mask]
+        cells = group_count * width
+        scores = np.bincount(keys, weights=self.weights[mask], minlength=cells)
+        counts = np.bincount(keys, minlength=cells)
+        result: List[List[Dict]] = []
+        for group in range(group_count):
+            row = slice(group * width, (group + 1) * width)
+            group_scores, group_counts = scores[row], counts[row]
+            present = np.flatnonzero(group_counts)
+            # Descending score, then term id for stable ties.
+            present = present[np.lexsort((present, -group_scores[present]))][:top_k]
+            result.append(
+                [
+                    {
+                        "topic": self.term(term),
+                        "count": int(group_counts[term]),
+                        "score": round(float(group_scores[term]), 4),
+                    }
+                    for term in present.tolist()
+                ]
+            )
+        return result
+
+
+def topic_terms(
+    documents: Sequence[Sequence[str]],
+    category_codes: Sequence[int],
+    categories: Sequence[str],
+    years: Sequence[int],
+    top_k: int = 20,
+    group_top_k: int = 10,
+) -> Dict[str, List]:
+    """Top unigram and bigram topics overall, per category and per year.
+
+    ``documents`` hold each title's ``analysis.title_words``.
+    ``category_codes`` index into ``categories``; a year of 0 is unknown
+    and leaves the title out of the per-year lists.
+    """
+    model = TopicModel(documents)
+    overall = model.top_terms(top_k=top_k)[0]
+    by_category = model.top_terms(
+        np.asarray(category_codes, dtype=np.int64), len(categories), group_top_k
+    )
+    year_values = np.asarray(years, dtype=np.int64)
+    known = np.unique(year_values[year_values > 0])
+    year_codes = np.where(year_values > 0, np.searchsorted(known, year_values), -1)
+    by_year = model.top_terms(year_codes, len(known), group_top_k)
+    return {
+        "overall": overall,
+        "by_category": [
+            {"category": category, "topics": topics}
+            for category, topics in sorted(zip(categories, by_category), key=lambda item: item[0])
+            if topics
+        ],
+        "by_year": [
+            {"year": year, "topics": topics} for year, topics in zip(known.tolist(), by_year) if topics
+        ],
+    }
@@ -1,10 +1,11 @@
 import argparse
+import hashlib
 import json
 import logging
 import os
 import sys
 from dataclasses import asdict
-from datetime import datetime, timezone
+from datetime import timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -15,52 +16,137 @@ if str(ROOT) not in sys.path:
 
 from paper_dashboard import analysis
 from paper_dashboard import citations
+from paper_dashboard.accumulators import run_accumulators
 from paper_dashboard.builder import render_dashboard
+from paper_dashboard.cache import ResponseCache
+from paper_dashboard.checkpoint import CitationCheckpoint
 from paper_dashboard.code_repos import (
+    GitHubScheduler,
     RepoMetadata,
     aggregate_languages,
     fetch_all_metadata,
     unique_github_repos,
 )
-from paper_dashboard.parser import (
-    PaperEntry,
-    ParseResult,
-    load_readme,
-    parse_readme,
-    sync_repo,
+from paper_dashboard.manifest import BuildManifest
+from paper_dashboard.metrics import registry as metrics
+from paper_dashboard.parser import PaperEntry, ParseResult
+from paper_dashboard.ratelimit import TokenBucket
+from paper_dashboard.repo_history import RepoHistory
+from paper_dashboard.search_index import SearchIndex, papers_digest
+from paper_dashboard.sources import (
+    ingest_sources,
+    merge_sources,
+    plan_sources,
+    sync_sources,
 )
+from paper_dashboard.table import PaperTable
+
+
+DEFAULT_PAPER_REPO_URL = "https://github.com/safe-graph/graph-fraud-detection-papers"
+# Options that change data.json; a build with different values is never a no-op.
+OUTPUT_OPTIONS = (
+    "output_dir",
+    "template",
+    "json_only",
+    "skip_code_fetch",
+    "skip_citations",
+    "citations_limit",
+    "citations_top_k",
+    "skip_search_index",
+)
+
+
+def build_fingerprint(args: argparse.Namespace) -> str:
+    options = {name: getattr(args, name) for name in OUTPUT_OPTIONS}
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_previous_build(path: Path) -> Dict:
+    """Return the ``stats`` of an earlier data.json, or ``{}`` if there is none."""
+    if not path.exists():
+        return {}
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        logging.warning("Ignoring unreadable previous build %s: %s", path, exc)
+        return {}
+    return previous.get("stats") or {}
+
+
+def load_previous_citations(stats: Dict) -> List[Dict]:
+    """Return ``paper_citations`` and ``survey_citations`` from a previous build's stats.
+
+    Entries written before per-entry timestamps existed inherit the build-wide
+    ``citation_updated_at`` so they age out like everything else.
+    """
+    fallback = stats.get("citation_updated_at")
+    entries = []
+    for entry in (stats.get("paper_citations") or []) + (stats.get("survey_citations") or []):
+        if not entry.get("citation_updated_at") and fallback:
+            entry = dict(entry, citation_updated_at=fallback)
+        entries.append(entry)
+    return entries
+
+
+def load_previous_misses(stats: Dict) -> List[Dict]:
+    """Return ``citation_misses`` and ``survey_misses`` (unmatched works) from a previous build."""
+    return (stats.get("citation_misses") or []) + (stats.get("survey_misses") or [])
+
+
+def load_previous_repos(stats: Dict) -> Dict[str, RepoMetadata]:
+    """Return a previous build's ``code_repos`` keyed by full name."""
+    repos: Dict[str, RepoMetadata] = {}
+    for raw in stats.get("code_repos") or []:
+        try:
+            repo = RepoMetadata(**raw)
+        except TypeError:
+            continue
+        repos[repo.full_name] = repo
+    return repos
 
 
 def build_stats(
     parsed: ParseResult,
     token: str,
     skip_code_fetch: bool,
-    skip_citations: bool,
-    citations_limit: Optional[int],
+    citation_results: Optional[citations.CitationResults],
     citations_top_k: int,
-    openalex_email: Optional[str],
-    openalex_api_key: Optional[str],
+    github_cache: Optional[ResponseCache] = None,
+    github_workers: int = 1,
+    github_scheduler: Optional[GitHubScheduler] = None,
+    previous_repos: Optional[Dict[str, RepoMetadata]] = None,
+    repo_history: Optional[RepoHistory] = None,
 ) -> Dict:
     papers = parsed.papers
-    stats: Dict = {
-        "year_counts": analysis.counts_by_year(papers),
-        "venue_counts": analysis.counts_by_venue(papers),
-        "topics": analysis.word_frequencies([p.title for p in papers]),
-        "code_availability": analysis.code_availability(papers),
-        "category_counts": analysis.counts_by_category(papers),
-        "method_counts": analysis.method_families(papers),
-        "domain_counts": analysis.domain_focus(papers),
-        "venue_strata": analysis.venue_strata(papers),
-        "dataset_counts": analysis.dataset_mentions(papers),
-        "paper_count": len(papers),
-    }
+    # One pass over the titles; column statistics come straight off the table.
+    # The table is temporary and lives alongside ``papers``, so it costs
+    # memory for the duration of the accumulators rather than saving any.
+    stats: Dict = run_accumulators(PaperTable.from_entries(papers))
 
     code_repos: List[RepoMetadata] = []
+    renames: Dict[str, str] = {}
     if not skip_code_fetch:
-        repo_names = unique_github_repos([p.code_url for p in papers if p.code_url])
+        repo_names = unique_github_repos(
+            [p.code_url for p in papers if p.code_url],
+            aliases=repo_history.aliases if repo_history else None,
+        )
         if repo_names:
-            code_repos = fetch_all_metadata(repo_names, token)
+            with metrics.timer("stage", "code_repos"):
+                code_repos = fetch_all_metadata(
+                    repo_names,
+                    token,
+                    cache=github_cache,
+                    max_workers=github_workers,
+                    scheduler=github_scheduler,
+                    priority={
+                        name: repo.stars for name, repo in (previous_repos or {}).items()
+                    },
+                    fallback=previous_repos,
+                    renames=renames,
+                )
         stats["language_counts"] = aggregate_languages(code_repos)
+        if repo_history is not None:
+            repo_history.record(code_repos, renames)
     else:
         stats["language_counts"] = []
 
@@ -78,24 +164,36 @@ def build_stats(
         key=lambda x: x["stars"],
         reverse=True,
     )[:10]
+    if repo_history is not None and not skip_code_fetch:
+        stats["star_trends"] = [
+            {"full_name": r["full_name"], "points": repo_history.star_trend(r["full_name"])}
+            for r in stats["top_repos"]
+        ]
+        stats["language_trends"] = repo_history.language_trend()
     stats["insights"] = analysis.derive_insights(stats)
-    if skip_citations:
+    if citation_results is None:
         stats["top_cited"] = []
         stats["paper_citations"] = []
         stats["citation_note"] = "Citation fetch skipped (run without --skip-citations)."
     else:
-        paper_citations, queried = citations.fetch_all_citations(
-            papers,
-            openalex_email=openalex_email,
-            openalex_api_key=openalex_api_key,
-            limit=citations_limit,
-        )
+        paper_citations = citation_results.paper_entries
+        queried = citation_results.queried
         stats["paper_citations"] = paper_citations
         stats["top_cited"] = citations.dedupe_entries(
             paper_citations, citations_top_k
         )
+        stats["citation_misses"] = citation_results.paper_misses
+        # Kept so incremental builds can reuse survey results as well.
+        stats["survey_citations"] = citation_results.extra_entries
+        stats["survey_misses"] = citation_results.extra_misses
         stats["citation_source"] = "OpenAlex"
-        stats["citation_updated_at"] = datetime.now(timezone.utc).isoformat()
+        # Reused entries keep their own timestamps; report the oldest one.
+        stats["citation_updated_at"] = citations.oldest_update(
+            paper_citations
+            + citation_results.paper_misses
+            + citation_results.extra_entries
+            + citation_results.extra_misses
+        )
         stats["citation_coverage"] = {
             "matched": len(paper_citations),
             "queried": queried,
@@ -110,17 +208,8 @@ def build_stats(
     return stats
 
 
-def build_resources(
-    parsed: ParseResult,
-    skip_citations: bool,
-    openalex_email: Optional[str],
-    openalex_api_key: Optional[str],
-) -> List[Dict]:
-    resources = [asdict(resource) for resource in parsed.resources]
-    if skip_citations:
-        return resources
-
-    surveys = [
+def survey_entries(parsed: ParseResult) -> List[PaperEntry]:
+    return [
         PaperEntry(
             year=None,
             title=resource.title,
@@ -132,14 +221,20 @@ def build_resources(
         for resource in parsed.resources
         if resource.category == "Survey Paper"
     ]
-    survey_citations, _ = citations.fetch_all_citations(
-        surveys,
-        openalex_email=openalex_email,
-        openalex_api_key=openalex_api_key,
-    )
-    citations_by_title = {entry["title"]: entry for entry in survey_citations}
+
+
+def build_resources(
+    parsed: ParseResult,
+    citation_results: Optional[citations.CitationResults],
+) -> List[Dict]:
+    resources = [asdict(resource) for resource in parsed.resources]
+    if citation_results is None:
+        return resources
+
     for resource in resources:
-        citation = citations_by_title.get(resource["title"])
+        if resource["category"] != "Survey Paper":
+            continue
+        citation = citation_results.lookup(resource["title"])
         if not citation:
             continue
         resource.update(
@@ -157,13 +252,20 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Build static dashboard for paper list.")
     parser.add_argument(
         "--paper-repo-url",
-        default="https://github.com/safe-graph/graph-fraud-detection-papers",
-        help="Source repo containing the curated paper list.",
+        action="append",
+        default=None,
+        help="Source repo containing a curated paper list; repeat to merge several lists.",
     )
     parser.add_argument(
         "--paper-repo-dir",
         default="data/papers_repo",
-        help="Where to clone/pull the paper list repository.",
+        help="Where to clone/pull the paper list repository (one subdirectory per repo when merging).",
+    )
+    parser.add_argument(
+        "--source-workers",
+        type=int,
+        default=None,
+        help="Worker processes used to sync and parse multiple source repos (defaults to one per repo, up to the CPU count).",
     )
     parser.add_argument(
         "--output-dir",
@@ -197,11 +299,116 @@ def main() -> None:
         default=10,
         help="Number of top cited papers to include in the dashboard.",
     )
+    parser.add_argument(
+        "--cache-dir",
+        default="data/cache",
+        help="Directory for the on-disk OpenAlex response cache (empty string disables it).",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=256,
+        help="Size budget for the response cache before least-recently-used entries are evicted.",
+    )
+    parser.add_argument(
+        "--refresh-citations",
+        action="store_true",
+        help="Ignore cached OpenAlex responses (fresh responses are still written back).",
+    )
+    parser.add_argument(
+        "--github-workers",
+        type=int,
+        default=4,
+        help="Concurrent GitHub requests: REST repo fetches or GraphQL batches.",
+    )
+    parser.add_argument(
+        "--repo-history",
+        default="data/repo_history.jsonl",
+        help="Append-only log of GitHub repo snapshots used for star/language trends (empty string disables it).",
+    )
+    parser.add_argument(
+        "--github-max-wait",
+        type=float,
+        default=60.0,
+        help="Longest wait (seconds) for a GitHub rate-limit reset before falling back to previous metadata.",
+    )
+    parser.add_argument(
+        "--citation-workers",
+        type=int,
+        default=4,
+        help="Number of papers resolved against OpenAlex concurrently.",
+    )
+    parser.add_argument(
+        "--openalex-rate",
+        type=float,
+        default=8.0,
+        help="Maximum OpenAlex requests per second shared by all citation workers.",
+    )
+    parser.add_argument(
+        "--incremental-citations",
+        action="store_true",
+        help="Reuse fresh citation entries from the previous data.json and only query new or stale papers.",
+    )
+    parser.add_argument(
+        "--previous-data",
+        default=None,
+        help="Previous data.json for incremental citations and GitHub fallbacks (defaults to <output-dir>/data.json).",
+    )
+    parser.add_argument(
+        "--citation-max-age-hours",
+        type=float,
+        default=168,
+        help="Citation entries older than this are re-queried in incremental mode.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default="data/citations.checkpoint.jsonl",
+        help="Progress log written while citations resolve (removed after a successful build).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the checkpoint of an interrupted run instead of starting over.",
+    )
+    parser.add_argument(
+        "--parse-cache",
+        default="data/readme_sections.json",
+        help="Parsed README sections reused when unchanged (empty string disables it).",
+    )
     parser.add_argument(
         "--skip-sync",
         action="store_true",
         help="Skip git clone/pull (assumes paper repo directory already contains README).",
     )
+    parser.add_argument(
+        "--full-sync",
+        action="store_true",
+        help="Clone/pull the full paper repo history instead of a shallow README-only fetch.",
+    )
+    parser.add_argument(
+        "--manifest",
+        default="data/build_manifest.json",
+        help="Record of the README blobs and options of the last successful build (empty string disables it).",
+    )
+    parser.add_argument(
+        "--metrics-output",
+        default="data/build_metrics.json",
+        help="Where to write request/latency metrics of this build; kept out of data.json so "
+        "unchanged inputs give an identical file (empty string disables it).",
+    )
+    parser.add_argument(
+        "--on-unchanged",
+        choices=("build", "enrich", "exit"),
+        default="build",
+        help="When no README changed since the last build: rebuild everything (default), only "
+        "re-query citations older than --citation-max-age-hours (reusing fresher ones from the "
+        "previous data.json), or exit without writing anything.",
+    )
+    parser.add_argument(
+        "--skip-search-index",
+        action="store_true",
+        help="Do not write the sharded title/venue/category search index to <output-dir>/search.",
+    )
     parser.add_argument(
         "--json-only",
         action="store_true",
@@ -223,35 +430,153 @@ def main() -> None:
     output_dir = Path(args.output_dir)
     template_path = Path(args.template)
 
-    if not args.skip_sync:
-        sync_repo(args.paper_repo_url, paper_repo_dir)
-    readme_text = load_readme(paper_repo_dir)
-    parsed = parse_readme(readme_text)
+    citation_cache = None
+    if args.cache_dir and not args.skip_citations:
+        citation_cache = ResponseCache(
+            Path(args.cache_dir) / "openalex",
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+            refresh=args.refresh_citations,
+        )
+
+    github_cache = None
+    if args.cache_dir and not args.skip_code_fetch:
+        # No TTL: entries are always revalidated with their ETag.
+        github_cache = ResponseCache(
+            Path(args.cache_dir) / "github",
+            max_bytes=args.cache_max_mb * 1024 * 1024,
+        )
+    openalex_limiter = TokenBucket(args.openalex_rate)
+    previous_path = (
+        Path(args.previous_data) if args.previous_data else output_dir / "data.json"
+    )
+    previous_stats = load_previous_build(previous_path)
+    previous_citations = None
+    previous_misses = None
+    if args.incremental_citations and not args.skip_citations:
+        previous_citations = load_previous_citations(previous_stats)
+        previous_misses = load_previous_misses(previous_stats)
+    github_scheduler = GitHubScheduler(max_wait=args.github_max_wait)
+    repo_history = None
+    previous_repos = load_previous_repos(previous_stats)
+    if args.repo_history and not args.skip_code_fetch:
+        repo_history = RepoHistory(Path(args.repo_history))
+        # The history covers repos an older data.json may no longer list.
+        previous_repos = {**repo_history.latest(), **previous_repos}
+
+    sources = plan_sources(
+        args.paper_repo_url or [DEFAULT_PAPER_REPO_URL],
+        paper_repo_dir,
+        Path(args.parse_cache) if args.parse_cache else None,
+    )
+    with metrics.timer("stage", "sync"):
+        readme_blobs = sync_sources(
+            sources,
+            sync=not args.skip_sync,
+            shallow=not args.full_sync,
+            max_workers=args.source_workers,
+        )
+
+    # Decide on a no-op build from the README blob ids alone, before parsing.
+    fingerprint = build_fingerprint(args)
+    manifest = BuildManifest(Path(args.manifest)) if args.manifest else None
+    unchanged = manifest is not None and manifest.unchanged(
+        readme_blobs, fingerprint, output_dir / "data.json"
+    )
+    if unchanged and not args.refresh_citations and args.on_unchanged == "exit":
+        logging.info("Paper lists unchanged since %s; nothing to do.", manifest.data.get("built_at"))
+        return
+    if unchanged and args.on_unchanged == "enrich" and not (args.skip_citations or args.refresh_citations):
+        logging.info("Paper lists unchanged; only refreshing stale enrichment data.")
+        previous_citations = load_previous_citations(previous_stats)
+        previous_misses = load_previous_misses(previous_stats)
+
+    with metrics.timer("stage", "parse"):
+        source_results = ingest_sources(sources, max_workers=args.source_workers)
+        for result in source_results:
+            diff = result.diff
+            if diff is None:
+                continue
+            logging.info(
+                "README %s: %d sections reused, %d reparsed; %d papers added, %d removed, %d changed",
+                result.source.url,
+                diff.reused_sections,
+                diff.reparsed_sections,
+                len(diff.added),
+                len(diff.removed),
+                len(diff.changed),
+            )
+            metrics.incr("readme.sections", "reused", diff.reused_sections)
+            metrics.incr("readme.sections", "reparsed", diff.reparsed_sections)
+        parsed = merge_sources(source_results)
+    with metrics.timer("stage", "enrich"):
+        analysis.enrich_papers(parsed.papers)
+
     papers_serializable = analysis.to_serializable(parsed.papers)
+    citation_results = None
+    checkpoint = None
+    if not args.skip_citations:
+        checkpoint = CitationCheckpoint(Path(args.checkpoint), fingerprint, resume=args.resume)
+        # Papers and survey resources share one deduplicated, rate-limited batch.
+        with metrics.timer("stage", "citations"):
+            citation_results = citations.resolve_citation_queue(
+                parsed.papers,
+                survey_entries(parsed),
+                limit=args.citations_limit,
+                openalex_email=openalex_email,
+                openalex_api_key=openalex_api_key,
+                cache=citation_cache,
+                max_workers=args.citation_workers,
+                limiter=openalex_limiter,
+                previous=previous_citations,
+                previous_misses=previous_misses,
+                max_age=timedelta(hours=args.citation_max_age_hours),
+                checkpoint=checkpoint,
+            )
     stats = build_stats(
         parsed,
         token=token,
         skip_code_fetch=args.skip_code_fetch,
-        skip_citations=args.skip_citations,
-        citations_limit=args.citations_limit,
+        citation_results=citation_results,
         citations_top_k=args.citations_top_k,
-        openalex_email=openalex_email,
-        openalex_api_key=openalex_api_key,
-    )
-    resources = build_resources(
-        parsed,
-        skip_citations=args.skip_citations,
-        openalex_email=openalex_email,
-        openalex_api_key=openalex_api_key,
+        github_cache=github_cache,
+        github_workers=args.github_workers,
+        github_scheduler=github_scheduler,
+        previous_repos=previous_repos,
+        repo_history=repo_history,
     )
+    resources = build_resources(parsed, citation_results)
+    if citation_cache is not None:
+        logging.info(
+            "OpenAlex cache: %d hits, %d misses",
+            citation_cache.hits,
+            citation_cache.misses,
+        )
+
+    for line in metrics.summary_lines():
+        logging.info("metrics %s", line)
 
+    papers_hash = papers_digest(papers_serializable)
     context = {
         "papers": papers_serializable,
+        "papers_hash": papers_hash,
         "stats": stats,
         "resources": resources,
     }
     output_dir.mkdir(parents=True, exist_ok=True)
     (output_dir / "data.json").write_text(json.dumps(context, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not args.skip_search_index:
+        SearchIndex.from_papers(parsed.papers).write(output_dir / "search", papers_hash)
+    if checkpoint is not None:
+        checkpoint.complete()
+    for result in source_results:
+        if result.parser is not None:
+            result.parser.save()
+    if manifest is not None:
+        manifest.save(readme_blobs, fingerprint, output_dir / "data.json")
+    if args.metrics_output:
+        metrics_path = Path(args.metrics_output)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        metrics_path.write_text(json.dumps(metrics.snapshot(), indent=2), encoding="utf-8")
     if not args.json_only:
         render_dashboard(template_path, output_dir, context)
 
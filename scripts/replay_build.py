@@ -0,0 +1,148 @@
+"""Replay a dashboard build against the recorded API fixtures.
+
+Starts ``standin_server.py`` on a free local port, points
+``OPENALEX_API_BASE`` and ``GITHUB_API_BASE`` at it and runs
+``build_dashboard.py`` on the fixture paper list, so the citation and GitHub
+stages run end to end without network access. Extra arguments after ``--``
+go to the build, e.g.::
+
+    python scripts/replay_build.py --latency-ms 5 -- --citation-workers 8
+"""
+
+import argparse
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SERVED_RE = re.compile(r"Served (\d+) requests \((\d+) throttled, (\d+) without a fixture\)")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Stand-in server did not start on port {port}")
+            time.sleep(0.05)
+
+
+def replay(args: argparse.Namespace, build_args) -> int:
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "standin_server.py"),
+            "--port",
+            str(port),
+            "--fixtures",
+            args.fixtures,
+            "--latency-ms",
+            str(args.latency_ms),
+            "--throttle-rate",
+            str(args.throttle_rate),
+        ],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        wait_for_port(port)
+        output_dir = Path(args.output_dir)
+        env = dict(
+            os.environ,
+            OPENALEX_API_BASE=f"http://127.0.0.1:{port}/openalex/works",
+            GITHUB_API_BASE=f"http://127.0.0.1:{port}/github",
+            OPENALEX_API_KEY=os.environ.get("OPENALEX_API_KEY") or "fixture",
+        )
+        # Replays go through REST; the fixtures hold no GraphQL responses of their own.
+        env.pop("GITHUB_TOKEN", None)
+        env.pop("GH_TOKEN", None)
+        started = time.perf_counter()
+        build = subprocess.run(
+            [
+                sys.executable,
+                str(ROOT / "scripts" / "build_dashboard.py"),
+                "--skip-sync",
+                "--paper-repo-dir",
+                args.papers,
+                "--output-dir",
+                str(output_dir),
+                "--json-only",
+                "--cache-dir",
+                "",
+                "--checkpoint",
+                str(output_dir / "citations.checkpoint.jsonl"),
+                "--parse-cache",
+                "",
+                "--manifest",
+                "",
+                "--metrics-output",
+                str(output_dir / "build_metrics.json"),
+                "--repo-history",
+                "",
+                *build_args,
+            ],
+            env=env,
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        server.send_signal(signal.SIGINT)
+        _, log = server.communicate(timeout=10)
+    served = SERVED_RE.search(log or "")
+    requests, throttled, missing = (int(n) for n in served.groups()) if served else (0, 0, 0)
+    print(
+        f"build exit {build.returncode} in {elapsed:.2f}s: "
+        f"{requests} requests ({throttled} throttled, {missing} without a fixture)"
+    )
+    if build.returncode:
+        return build.returncode
+    return 1 if missing and args.strict else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a build against recorded API fixtures.")
+    parser.add_argument("--fixtures", default=str(ROOT / "fixtures" / "api"))
+    parser.add_argument(
+        "--papers",
+        default=str(ROOT / "fixtures" / "papers"),
+        help="Checkout holding the README the fixtures were recorded for.",
+    )
+    parser.add_argument("--output-dir", default=None, help="Defaults to a temporary directory.")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fail when the build requested anything the fixtures do not cover.",
+    )
+    argv = sys.argv[1:]
+    build_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, build_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    if args.output_dir:
+        sys.exit(replay(args, build_args))
+    with tempfile.TemporaryDirectory() as tmp:
+        args.output_dir = tmp
+        sys.exit(replay(args, build_args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Local record/replay stand-in for the OpenAlex and GitHub APIs.
+
+Serves ``/openalex/works/{id}``, ``/openalex/works?filter=|search=`` and
+``/github/repos/{owner}/{repo}[/languages]`` from recorded fixtures, with
+optional latency and injected 429s. ``POST /github/graphql`` answers batched
+repository queries from the same REST fixtures. Point the pipeline at it with::
+
+    OPENALEX_API_BASE=http://127.0.0.1:8765/openalex/works \\
+    GITHUB_API_BASE=http://127.0.0.1:8765/github \\
+    python scripts/build_dashboard.py ...
+
+Run with ``--record`` once (with real credentials in the environment) to
+proxy misses to the live APIs and save their responses as fixtures.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+# Ensure repository root is on sys.path when executed as a script
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from paper_dashboard import http_client
+from paper_dashboard.cache import ResponseCache
+
+
+UPSTREAMS = {
+    "openalex": "https://api.openalex.org",
+    "github": "https://api.github.com",
+}
+# Forwarded to the upstream in record mode; everything else stays local.
+FORWARDED_HEADERS = ("Accept", "Authorization", "User-Agent")
+
+
+class FixtureStore:
+    """Recorded responses keyed like the response cache (path + query)."""
+
+    def __init__(self, root: Path) -> None:
+        # Fixtures never expire and are never evicted.
+        self._cache = ResponseCache(root, max_bytes=sys.maxsize, ttls={})
+
+    def get(self, service: str, path: str, params: Dict[str, str]) -> Optional[Dict]:
+        entry = self._cache.peek(f"{service}{path}", params)
+        return entry.payload if entry else None
+
+    def put(
+        self, service: str, path: str, params: Dict[str, str], status: int, body
+    ) -> None:
+        self._cache.put(
+            f"{service}{path}", params, service, {"status": status, "body": body}
+        )
+
+
+class StandinConfig:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.store = FixtureStore(Path(args.fixtures))
+        self.record = args.record
+        self.latency = args.latency_ms / 1000.0
+        self.jitter = args.jitter_ms / 1000.0
+        self.throttle_rate = args.throttle_rate
+        self.retry_after = args.retry_after
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.missing = 0
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, every
+    # keep-alive request would wait for the client's delayed ACK (~40ms).
+    disable_nagle_algorithm = True
+    config: StandinConfig
+
+    def log_message(self, fmt: str, *args) -> None:
+        logging.debug("%s " + fmt, self.address_string(), *args)
+
+    def _send_json(self, status: int, body, headers: Optional[Dict[str, str]] = None) -> None:
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _route(self) -> Tuple[Optional[str], str, Dict[str, str]]:
+        parts = urlsplit(self.path)
+        service, _, rest = parts.path.lstrip("/").partition("/")
+        params = {
+            k: v for k, v in parse_qsl(parts.query) if k not in ("api_key", "mailto")
+        }
+        if service not in UPSTREAMS:
+            return None, "", params
+        return service, "/" + unquote(rest), params
+
+    def _simulate(self) -> bool:
+        """Apply configured latency; return True if a 429 was sent instead."""
+        config = self.config
+        with config.lock:
+            config.requests += 1
+            throttle = config.random.random() < config.throttle_rate
+            if throttle:
+                config.throttled += 1
+            delay = config.latency + config.random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+        if throttle:
+            self._send_json(
+                429,
+                {"error": "injected rate limit"},
+                {"Retry-After": str(config.retry_after)},
+            )
+        return throttle
+
+    def _fixture(self, service: str, path: str, params: Dict[str, str]) -> Optional[Dict]:
+        """Recorded response, else a synthesized batch, else (recording) upstream."""
+        fixture = self.config.store.get(service, path, params)
+        if fixture is None and service == "openalex":
+            fixture = self._synthesize_doi_filter(path, params)
+        if fixture is None and self.config.record:
+            fixture = self._record(service, path, params)
+        return fixture
+
+    def do_GET(self) -> None:
+        if self._simulate():
+            return
+
+        service, path, params = self._route()
+        if service is None:
+            self._send_json(404, {"error": "unknown service"})
+            return
+        fixture = self._fixture(service, path, params)
+        if fixture is None:
+            with self.config.lock:
+                self.config.missing += 1
+            self._send_json(404, {"error": "no fixture", "path": path})
+            return
+        if service == "github" and fixture["status"] == 200:
+            # Mimic GitHub's conditional requests so ETag reuse is measurable.
+            digest = hashlib.sha1(json.dumps(fixture["body"], sort_keys=True).encode("utf-8"))
+            etag = f'"{digest.hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self._send_json(200, fixture["body"], {"ETag": etag})
+            return
+        self._send_json(fixture["status"], fixture["body"])
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self._simulate():
+            return
+        service, path, _ = self._route()
+        if service != "github" or path != "/graphql":
+            self._send_json(404, {"error": "unknown endpoint"})
+            return
+        try:
+            variables = json.loads(raw or b"{}").get("variables") or {}
+        except ValueError:
+            self._send_json(400, {"message": "invalid JSON body"})
+            return
+        data: Dict[str, Optional[Dict]] = {}
+        errors: List[Dict] = []
+        index = 0
+        while f"o{index}" in variables:
+            alias = f"r{index}"
+            name = f"{variables[f'o{index}']}/{variables[f'n{index}']}"
+            node = self._graphql_repository(name)
+            data[alias] = node
+            if node is None:
+                errors.append({"type": "NOT_FOUND", "path": [alias]})
+            index += 1
+        body: Dict = {"data": data}
+        if errors:
+            body["errors"] = errors
+        self._send_json(200, body)
+
+    def _graphql_repository(self, name: str) -> Optional[Dict]:
+        meta = self._fixture("github", f"/repos/{name}", {})
+        if not meta or meta["status"] != 200:
+            return None
+        languages = self._fixture("github", f"/repos/{name}/languages", {})
+        sizes = languages["body"] if languages and languages["status"] == 200 else {}
+        repo = meta["body"]
+        language = repo.get("language")
+        return {
+            "nameWithOwner": repo.get("full_name") or name,
+            "url": repo.get("html_url"),
+            "stargazerCount": repo.get("stargazers_count", 0),
+            "primaryLanguage": {"name": language} if language else None,
+            "repositoryTopics": {
+                "nodes": [{"topic": {"name": t}} for t in repo.get("topics") or []]
+            },
+            "languages": {
+                "edges": [
+                    {"size": size, "node": {"name": lang}}
+                    for lang, size in sorted(sizes.items(), key=lambda kv: -kv[1])
+                ]
+            },
+        }
+
+    def _synthesize_doi_filter(self, path: str, params: Dict[str, str]) -> Optional[Dict]:
+        """Answer batched ``filter=doi:a|b`` lookups from singleton fixtures."""
+        value = params.get("filter", "")
+        if path != "/works" or not value.startswith("doi:") or "," in value:
+            return None
+        results: List[Dict] = []
+        single = {k: v for k, v in params.items() if k == "select"}
+        for doi in value[len("doi:"):].split("|"):
+            fixture = self.config.store.get(
+                "openalex", f"/works/https://doi.org/{doi}", single
+            )
+            if fixture is None:
+                return None
+            if fixture["status"] == 200:
+                results.append(fixture["body"])
+        return {
+            "status": 200,
+            "body": {"meta": {"count": len(results)}, "results": results},
+        }
+
+    def _record(self, service: str, path: str, params: Dict[str, str]) -> Optional[Dict]:
+        upstream_params = dict(params)
+        if service == "openalex":
+            if os.environ.get("OPENALEX_API_KEY"):
+                upstream_params["api_key"] = os.environ["OPENALEX_API_KEY"]
+            if os.environ.get("OPENALEX_EMAIL"):
+                upstream_params["mailto"] = os.environ["OPENALEX_EMAIL"]
+        headers = {
+            name: self.headers[name] for name in FORWARDED_HEADERS if self.headers.get(name)
+        }
+        try:
+            resp = http_client.get(
+                f"{UPSTREAMS[service]}{path}",
+                params=upstream_params,
+                headers=headers,
+                timeout=30,
+            )
+        except Exception as exc:  # noqa: BLE001 - surface any proxy failure as 502
+            logging.warning("Upstream request failed: %s", exc)
+            return {"status": 502, "body": {"error": str(exc)}}
+        try:
+            body = resp.json()
+        except ValueError:
+            body = {"error": resp.text[:200]}
+        # Don't bake upstream throttling or auth failures into fixtures.
+        if resp.status_code in {200, 404}:
+            self.config.store.put(service, path, params, resp.status_code, body)
+        return {"status": resp.status_code, "body": body}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded OpenAlex/GitHub fixtures.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--fixtures",
+        default="fixtures/api",
+        help="Directory holding recorded responses.",
+    )
+    parser.add_argument(
+        "--record",
+        action="store_true",
+        help="Proxy fixture misses to the live APIs and save the responses.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency per request.")
+    parser.add_argument(
+        "--throttle-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 429.",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds sent with injected 429s.",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and 429 injection.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    StandinHandler.config = StandinConfig(args)
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    logging.info("Serving fixtures from %s on http://%s:%d", args.fixtures, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        config = StandinHandler.config
+        logging.info(
+            "Served %d requests (%d throttled, %d without a fixture)",
+            config.requests,
+            config.throttled,
+            config.missing,
+        )
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from paper_dashboard.citations import citation_key, resolve_citation_queue, unique_papers
+from paper_dashboard.parser import PaperEntry
+
+
+def _paper(title, url, category="Paper"):
+    return PaperEntry(
+        year=None, title=title, venue="", paper_url=url, code_url=None, category=category
+    )
+
+
+def _entry(paper, count):
+    return {
+        "title": paper.title,
+        "citation_count": count,
+        "year": None,
+        "paper_url": paper.paper_url,
+        "citation_updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def test_unique_papers_key_on_identifiers_before_titles():
+    preprint = _paper("Fraud Detection with GNNs", "https://arxiv.org/abs/2001.06362v2")
+    renamed = _paper(
+        "Fraud detection with graph neural networks", "https://arxiv.org/pdf/2001.06362"
+    )
+    namesake = _paper("Fraud Detection with GNNs", "https://doi.org/10.1145/3340531.3411903")
+    unlinked = _paper("Fraud Detection with GNNs", None)
+
+    assert citation_key(preprint) == "arxiv:2001.06362"
+    assert citation_key(namesake) == "doi:10.1145/3340531.3411903"
+    assert citation_key(unlinked) == "title:fraud detection with gnns"
+    assert unique_papers([preprint, renamed, namesake, unlinked]) == [
+        preprint,
+        namesake,
+        unlinked,
+    ]
+
+
+def test_queue_splits_papers_and_surveys_by_key():
+    paper = _paper("Fraud Detection with GNNs", "https://arxiv.org/abs/2001.06362")
+    namesake = _paper("Fraud Detection with GNNs", "https://doi.org/10.1145/3340531.3411903")
+    survey = _paper(
+        "A Survey of Graph Fraud Detection", "https://arxiv.org/abs/2001.06362", "Survey Paper"
+    )
+    other_survey = _paper("Graph Anomaly Detection: A Survey", "https://arxiv.org/abs/2106.07178")
+
+    # Everything is fresh in the previous build, so nothing is queried.
+    results = resolve_citation_queue(
+        [paper, namesake],
+        [survey, other_survey],
+        previous=[_entry(paper, 10), _entry(namesake, 20), _entry(other_survey, 30)],
+        max_age=timedelta(days=1),
+    )
+
+    assert results.queried == 2
+    assert [e["citation_count"] for e in results.paper_entries] == [10, 20]
+    assert [e["citation_count"] for e in results.extra_entries] == [30]
+    assert results.lookup(survey.title)["citation_count"] == 10
+    assert results.lookup(other_survey.title)["citation_count"] == 30
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from paper_dashboard.parser import parse_readme
+from paper_dashboard.sources import PaperSource, SourceResult, merge_sources
+
+
+README = """\
+## Toolbox [[Back to Top]](#a)
+[GNN-based Fake News Detection](https://github.com/safe-graph/GNN-FakeNews)
+[DGFraud](https://github.com/safe-graph/DGFraud)
+
+## Dataset [[Back to Top]](#a)
+[Twitter Fake News Propagation Graph Dataset](https://github.com/safe-graph/GNN-FakeNews)
+[YelpChi](https://example.org/yelpchi)
+"""
+
+OTHER_README = """\
+## Toolbox [[Back to Top]](#a)
+[DGFraud toolbox](https://github.com/safe-graph/DGFraud)
+[PyOD](https://github.com/yzhao062/pyod)
+"""
+
+
+def _result(url, text):
+    return SourceResult(PaperSource(url, Path(".")), parse_readme(text))
+
+
+def test_single_source_keeps_every_resource():
+    merged = merge_sources([_result("https://github.com/a/list", README)])
+    assert merged.resources == parse_readme(README).resources
+
+
+def test_resources_dedupe_only_against_earlier_sources():
+    merged = merge_sources(
+        [
+            _result("https://github.com/a/list", README),
+            _result("https://github.com/b/list", OTHER_README),
+        ]
+    )
+    assert [r.title for r in merged.resources] == [
+        "GNN-based Fake News Detection",
+        "DGFraud",
+        "Twitter Fake News Propagation Graph Dataset",
+        "YelpChi",
+        "PyOD",
+    ]
@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _replay(output_dir, *build_args):
+    run = subprocess.run(
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "replay_build.py"),
+            "--strict",
+            "--output-dir",
+            str(output_dir),
+            "--",
+            *build_args,
+        ],
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert run.returncode == 0, run.stdout + run.stderr
+    return run.stdout, json.loads((output_dir / "data.json").read_text(encoding="utf-8"))
+
+
+def test_build_replays_against_recorded_fixtures(tmp_path):
+    output, data = _replay(tmp_path, "--citation-workers", "4", "--github-workers", "4")
+    assert "0 without a fixture" in output
+
+    stats = data["stats"]
+    assert len(data["papers"]) == 32
+    assert len(data["resources"]) == 8
+    assert stats["citation_coverage"] == {"matched": 28, "queried": 32, "percentage": 87.5}
+    assert len(stats["citation_misses"]) == 4
+    assert stats["top_cited"][0]["citation_count"] == 640
+    assert len(stats["code_repos"]) == 13
+
+
+def test_incremental_replay_reuses_papers_and_surveys(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    _, previous = _replay(first, "--skip-code-fetch")
+    assert len(previous["stats"]["survey_citations"]) + len(previous["stats"]["survey_misses"]) == 4
+
+    output, data = _replay(
+        second,
+        "--skip-code-fetch",
+        "--incremental-citations",
+        "--previous-data",
+        str(first / "data.json"),
+    )
+    assert ": 0 requests" in output
+    assert data["stats"]["paper_citations"] == previous["stats"]["paper_citations"]
+    assert data["resources"] == previous["resources"]